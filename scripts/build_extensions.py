@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Optional Cython build for the Adaptive Learning System models
+
+Compiles the Pydantic model modules into native extensions placed next to
+their .py sources, so CPython imports the compiled version. The build only
+runs when CYTHON_COMPILED=1 is set; otherwise the pure-Python modules are used.
+The compiled build is not part of the Docker image or any automated test run,
+so run the test suite against it before deploying compiled modules.
+
+Usage:
+    CYTHON_COMPILED=1 python scripts/build_extensions.py build_ext --inplace
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Modules compiled into native extensions
+COMPILED_MODULES = [
+    "src/models/learner_profile.py",
+    "src/models/mastery.py",
+]
+
+
+def main():
+    """Cythonize the model modules in place"""
+    if os.getenv("CYTHON_COMPILED") != "1":
+        print("CYTHON_COMPILED is not set to 1, skipping native build")
+        return
+
+    try:
+        from Cython.Build import cythonize
+        from setuptools import setup
+    except ImportError:
+        print("❌ Cython and setuptools are required: pip install cython setuptools")
+        sys.exit(1)
+
+    # Build relative to the repository root so module names match the package
+    os.chdir(Path(__file__).parent.parent)
+
+    setup(
+        name="adaptive-learning-extensions",
+        ext_modules=cythonize(
+            COMPILED_MODULES,
+            language_level=3,
+            compiler_directives={
+                # Treat annotations as hints only; Cython would otherwise reject
+                # Pydantic model classes passed where ``type`` is annotated
+                "annotation_typing": False,
+                # Keep Python-visible signatures for Pydantic validator introspection
+                "binding": True,
+            },
+        ),
+        script_args=sys.argv[1:] or ["build_ext", "--inplace"],
+    )
+
+
+if __name__ == "__main__":
+    main()
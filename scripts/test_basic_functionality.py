@@ -10,8 +10,8 @@ import asyncio
 import sys
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+# Add the project root to path so models are only ever imported as src.*
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.models.learner_profile import (
     LearnerProfileCreate,
@@ -17,6 +17,7 @@ from ..models.learner_profile import (
     LearnerProfileUpdate,
     LearnerProfileResponse
 )
+from .responses import ORJSONResponse
 from ..api.auth import (
     get_current_active_user,
     authenticate_user,
@@ -27,8 +28,24 @@ from ..api.auth import (
 
 router = APIRouter(prefix="/api/v1/learners", tags=["learner-profiles"])
 
+# Profile fields exposed in responses (id is serialized separately as a string)
+_RESPONSE_FIELDS = set(LearnerProfileResponse.__fields__) - {"id"}
 
-@router.post("/register", response_model=LearnerProfileResponse, status_code=status.HTTP_201_CREATED)
+
+def _profile_response(profile: LearnerProfile, status_code: int = status.HTTP_200_OK) -> ORJSONResponse:
+    """
+    Serialize a learner profile straight to JSON
+    
+    The profile was validated when it was loaded, so the response is built from
+    its data directly instead of running it through LearnerProfileResponse again.
+    LearnerProfileResponse remains the documented response schema.
+    """
+    content = profile.dict(include=_RESPONSE_FIELDS)
+    content["id"] = str(profile.id)
+    return ORJSONResponse(content=content, status_code=status_code)
+
+
+@router.post("/register", response_model=LearnerProfileResponse, response_class=ORJSONResponse, status_code=status.HTTP_201_CREATED)
 async def register_learner(profile_data: LearnerProfileCreate):
     """
     Register a new learner profile
@@ -44,24 +61,7 @@ async def register_learner(profile_data: LearnerProfileCreate):
         created_profile = await repository.create_learner_profile(profile_data)
         
         # Convert to response model
-        return LearnerProfileResponse(
-            id=str(created_profile.id),
-            email=created_profile.email,
-            first_name=created_profile.first_name,
-            last_name=created_profile.last_name,
-            username=created_profile.username,
-            demographics=created_profile.demographics,
-            learning_preferences=created_profile.learning_preferences,
-            programming_experience=created_profile.programming_experience,
-            accessibility_settings=created_profile.accessibility_settings,
-            goals=created_profile.goals,
-            interests=created_profile.interests,
-            is_active=created_profile.is_active,
-            created_at=created_profile.created_at,
-            updated_at=created_profile.updated_at,
-            last_login=created_profile.last_login,
-            profile_completion_percentage=created_profile.profile_completion_percentage
-        )
+        return _profile_response(created_profile, status_code=status.HTTP_201_CREATED)
         
     except ValueError as e:
         raise HTTPException(
@@ -99,7 +99,7 @@ async def login_learner(form_data: OAuth2PasswordRequestForm = Depends()):
     return await create_user_token(user)
 
 
-@router.get("/me", response_model=LearnerProfileResponse)
+@router.get("/me", response_model=LearnerProfileResponse, response_class=ORJSONResponse)
 async def get_current_learner_profile(
     current_user: LearnerProfile = Depends(get_current_active_user)
 ):
@@ -108,27 +108,10 @@ async def get_current_learner_profile(
     
     Returns the complete profile information for the authenticated learner.
     """
-    return LearnerProfileResponse(
-        id=str(current_user.id),
-        email=current_user.email,
-        first_name=current_user.first_name,
-        last_name=current_user.last_name,
-        username=current_user.username,
-        demographics=current_user.demographics,
-        learning_preferences=current_user.learning_preferences,
-        programming_experience=current_user.programming_experience,
-        accessibility_settings=current_user.accessibility_settings,
-        goals=current_user.goals,
-        interests=current_user.interests,
-        is_active=current_user.is_active,
-        created_at=current_user.created_at,
-        updated_at=current_user.updated_at,
-        last_login=current_user.last_login,
-        profile_completion_percentage=current_user.profile_completion_percentage
-    )
+    return _profile_response(current_user)
 
 
-@router.put("/me", response_model=LearnerProfileResponse)
+@router.put("/me", response_model=LearnerProfileResponse, response_class=ORJSONResponse)
 async def update_current_learner_profile(
     update_data: LearnerProfileUpdate,
     current_user: LearnerProfile = Depends(get_current_active_user)
@@ -152,27 +135,10 @@ async def update_current_learner_profile(
             detail="Profile not found or could not be updated"
         )
     
-    return LearnerProfileResponse(
-        id=str(updated_profile.id),
-        email=updated_profile.email,
-        first_name=updated_profile.first_name,
-        last_name=updated_profile.last_name,
-        username=updated_profile.username,
-        demographics=updated_profile.demographics,
-        learning_preferences=updated_profile.learning_preferences,
-        programming_experience=updated_profile.programming_experience,
-        accessibility_settings=updated_profile.accessibility_settings,
-        goals=updated_profile.goals,
-        interests=updated_profile.interests,
-        is_active=updated_profile.is_active,
-        created_at=updated_profile.created_at,
-        updated_at=updated_profile.updated_at,
-        last_login=updated_profile.last_login,
-        profile_completion_percentage=updated_profile.profile_completion_percentage
-    )
+    return _profile_response(updated_profile)
 
 
-@router.get("/{learner_id}", response_model=LearnerProfileResponse)
+@router.get("/{learner_id}", response_model=LearnerProfileResponse, response_class=ORJSONResponse)
 async def get_learner_profile(
     learner_id: str,
     current_user: LearnerProfile = Depends(get_current_active_user)
@@ -201,24 +167,7 @@ async def get_learner_profile(
             detail="Learner profile not found"
         )
     
-    return LearnerProfileResponse(
-        id=str(profile.id),
-        email=profile.email,
-        first_name=profile.first_name,
-        last_name=profile.last_name,
-        username=profile.username,
-        demographics=profile.demographics,
-        learning_preferences=profile.learning_preferences,
-        programming_experience=profile.programming_experience,
-        accessibility_settings=profile.accessibility_settings,
-        goals=profile.goals,
-        interests=profile.interests,
-        is_active=profile.is_active,
-        created_at=profile.created_at,
-        updated_at=profile.updated_at,
-        last_login=profile.last_login,
-        profile_completion_percentage=profile.profile_completion_percentage
-    )
+    return _profile_response(profile)
 
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
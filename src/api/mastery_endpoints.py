@@ -5,11 +5,13 @@ This module provides REST API endpoints for logging learner interactions,
 retrieving progress reports, and managing mastery data.
 """
 
+import asyncio
+import heapq
 import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 import time
 
 from ..models.mastery import (
@@ -19,9 +21,11 @@ from ..models.mastery import (
     ProgressReport,
     MasteryUpdateResponse,
     MicroCompetency,
+    BKTDiagnostics,
     ActivityType,
     DifficultyLevel
 )
+from .responses import ORJSONResponse
 from ..core.bkt_engine import BKTEngine
 from ..db.mastery_repository import MasteryRepository
 from ..utils.dependencies import get_mastery_repository, get_bkt_engine
@@ -31,8 +35,14 @@ logger = logging.getLogger(__name__)
 # Create router for mastery tracking endpoints
 router = APIRouter(prefix="/api/v1/mastery", tags=["mastery"])
 
+# Maximum number of practice activities returned in a progress report
+MAX_RECOMMENDED_ACTIVITIES = 10
 
-@router.post("/interactions", response_model=MasteryUpdateResponse)
+# Maximum number of interactions a diagnostics request may score
+MAX_DIAGNOSTIC_INTERACTIONS = 10000
+
+
+@router.post("/interactions", response_model=MasteryUpdateResponse, response_class=ORJSONResponse)
 async def log_interaction(
     interaction_request: InteractionLogRequest,
     background_tasks: BackgroundTasks,
@@ -48,53 +58,45 @@ async def log_interaction(
     start_time = time.time()
     
     try:
-        # Convert request to interaction model
-        interaction = LearnerInteraction(
-            learner_id=interaction_request.learner_id,
-            activity_id=interaction_request.activity_id,
-            activity_type=interaction_request.activity_type,
-            interaction_type=interaction_request.interaction_type,
-            competency_ids=interaction_request.competency_ids,
-            score=interaction_request.score,
-            is_correct=interaction_request.is_correct,
-            attempts=interaction_request.attempts,
-            time_spent=interaction_request.time_spent,
-            hints_used=interaction_request.hints_used,
-            difficulty_level=interaction_request.difficulty_level,
-            session_id=interaction_request.session_id,
-            metadata=interaction_request.metadata,
-            started_at=interaction_request.started_at,
-            completed_at=interaction_request.completed_at or datetime.utcnow()
+        # Convert request to interaction model; the request body was already
+        # validated by FastAPI, so skip running the validators a second time
+        now = datetime.utcnow()
+        interaction = LearnerInteraction.construct(
+            **interaction_request.dict(exclude={"completed_at"}),
+            completed_at=interaction_request.completed_at or now,
+            created_at=now
         )
         
-        # Save the interaction
-        interaction_id = await repository.save_interaction(interaction)
+        # Save the interaction while the current mastery levels are fetched
+        interaction_id, mastery_lookup = await asyncio.gather(
+            repository.save_interaction(interaction),
+            repository.get_mastery_levels(interaction.learner_id, interaction.competency_ids)
+        )
         logger.info(f"Logged interaction {interaction_id} for learner {interaction.learner_id}")
         
         # Update mastery levels for all competencies in the interaction
         updated_competencies = []
         new_mastery_levels = {}
         newly_mastered = []
+        pending_writes = {}
         
         for competency_id in interaction.competency_ids:
             # Get or create mastery level
-            mastery_level = await repository.get_mastery_level(
-                interaction.learner_id, 
-                competency_id
-            )
+            mastery_level = mastery_lookup.get(competency_id)
             
             if mastery_level is None:
-                mastery_level = await repository.create_initial_mastery_level(
-                    interaction.learner_id, 
-                    competency_id
+                mastery_level = MasteryLevel(
+                    learner_id=interaction.learner_id,
+                    competency_id=competency_id,
+                    current_mastery=bkt_engine.default_parameters.prior_knowledge,
+                    bkt_parameters=bkt_engine.default_parameters
                 )
             
             # Update mastery using BKT
             was_mastered = mastery_level.is_mastered
             updated_mastery = bkt_engine.update_mastery(mastery_level, interaction)
-            
-            # Save updated mastery level
-            await repository.save_mastery_level(updated_mastery)
+            mastery_lookup[competency_id] = updated_mastery
+            pending_writes[competency_id] = updated_mastery
             
             # Track changes
             updated_competencies.append(competency_id)
@@ -103,6 +105,9 @@ async def log_interaction(
             if not was_mastered and updated_mastery.is_mastered:
                 newly_mastered.append(competency_id)
         
+        # Flush all updated mastery levels in one unordered bulk write
+        await repository.save_mastery_levels(list(pending_writes.values()))
+        
         processing_time = time.time() - start_time
         
         # Schedule background analytics update if needed
@@ -113,13 +118,16 @@ async def log_interaction(
             interaction.competency_ids
         )
         
-        response = MasteryUpdateResponse(
-            learner_id=interaction.learner_id,
-            updated_competencies=updated_competencies,
-            new_mastery_levels=new_mastery_levels,
-            newly_mastered=newly_mastered,
-            processing_time=processing_time
-        )
+        # Output-only payload: serialize directly rather than re-validating
+        # it through MasteryUpdateResponse (still the documented schema)
+        response = ORJSONResponse(content={
+            "learner_id": interaction.learner_id,
+            "updated_competencies": updated_competencies,
+            "new_mastery_levels": new_mastery_levels,
+            "newly_mastered": newly_mastered,
+            "processing_time": processing_time,
+            "timestamp": datetime.utcnow()
+        })
         
         logger.info(
             f"Updated mastery for learner {interaction.learner_id}, "
@@ -134,7 +142,7 @@ async def log_interaction(
         raise HTTPException(status_code=500, detail=f"Failed to log interaction: {str(e)}")
 
 
-@router.get("/progress/{learner_id}", response_model=ProgressReport)
+@router.get("/progress/{learner_id}", response_model=ProgressReport, response_class=ORJSONResponse)
 async def get_learner_progress(
     learner_id: str,
     include_recent_interactions: bool = Query(True, description="Include recent interactions in report"),
@@ -185,7 +193,9 @@ async def get_learner_progress(
             mastery_levels
         )
         
-        progress_report = ProgressReport(
+        # Every input is already a validated model or computed here, so skip
+        # re-validating the nested mastery levels and interactions
+        progress_report = ProgressReport.construct(
             learner_id=learner_id,
             total_competencies=total_competencies,
             mastered_competencies=mastered_competencies,
@@ -198,7 +208,7 @@ async def get_learner_progress(
         )
         
         logger.info(f"Generated progress report for learner {learner_id}")
-        return progress_report
+        return ORJSONResponse(content=progress_report.dict(by_alias=True))
         
     except HTTPException:
         raise
@@ -207,7 +217,7 @@ async def get_learner_progress(
         raise HTTPException(status_code=500, detail=f"Failed to generate progress report: {str(e)}")
 
 
-@router.get("/mastery/{learner_id}/{competency_id}", response_model=MasteryLevel)
+@router.get("/mastery/{learner_id}/{competency_id}", response_model=MasteryLevel, response_class=ORJSONResponse)
 async def get_mastery_level(
     learner_id: str,
     competency_id: str,
@@ -223,7 +233,7 @@ async def get_mastery_level(
                 detail=f"No mastery data found for learner {learner_id} and competency {competency_id}"
             )
         
-        return mastery_level
+        return ORJSONResponse(content=mastery_level.dict(by_alias=True))
         
     except HTTPException:
         raise
@@ -252,11 +262,11 @@ async def get_learner_interactions(
         if activity_type:
             interactions = [i for i in interactions if i.activity_type == activity_type]
         
-        return {
+        return ORJSONResponse(content={
             "learner_id": learner_id,
             "total_interactions": len(interactions),
-            "interactions": interactions
-        }
+            "interactions": [interaction.dict(by_alias=True) for interaction in interactions]
+        })
         
     except Exception as e:
         logger.error(f"Error getting learner interactions: {str(e)}")
@@ -286,6 +296,32 @@ async def get_competency_stats(
         raise HTTPException(status_code=500, detail=f"Failed to get competency stats: {str(e)}")
 
 
+@router.get("/competencies/{competency_id}/diagnostics", response_model=BKTDiagnostics, response_class=ORJSONResponse)
+async def get_competency_diagnostics(
+    competency_id: str,
+    limit: int = Query(
+        MAX_DIAGNOSTIC_INTERACTIONS, ge=1, le=MAX_DIAGNOSTIC_INTERACTIONS,
+        description="Maximum number of interactions to score"
+    ),
+    repository: MasteryRepository = Depends(get_mastery_repository),
+    bkt_engine: BKTEngine = Depends(get_bkt_engine)
+):
+    """Get goodness-of-fit diagnostics of the BKT parameters for a competency."""
+    try:
+        interactions = await repository.get_competency_histories(competency_id, limit=limit)
+        
+        # The forward pass and bootstrap are CPU-bound; keep them off the event loop
+        diagnostics = await run_in_threadpool(
+            bkt_engine.diagnose_parameters, competency_id, interactions
+        )
+        
+        return ORJSONResponse(content=diagnostics.dict())
+        
+    except Exception as e:
+        logger.error(f"Error computing competency diagnostics: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to compute competency diagnostics: {str(e)}")
+
+
 @router.get("/analytics/dashboard/{learner_id}")
 async def get_learner_dashboard(
     learner_id: str,
@@ -355,9 +391,8 @@ async def update_analytics_cache(
         # Example: Update learner progress summary cache
         summary = await repository.get_learner_progress_summary(learner_id)
         
-        # Example: Update competency performance stats cache
-        for competency_id in competency_ids:
-            stats = await repository.get_competency_performance_stats(competency_id)
+        # Example: Update competency performance stats cache (one aggregation)
+        stats = await repository.get_competency_performance_stats_many(competency_ids)
         
         logger.info(f"Analytics cache updated for learner {learner_id}")
         
@@ -420,11 +455,11 @@ async def generate_recommendations(
         recommended_activities = []
         focus_areas = []
         
-        # Sort by mastery level to identify areas needing attention
-        sorted_mastery = sorted(mastery_levels, key=lambda x: x.current_mastery)
+        # Select the lowest mastery levels to identify areas needing attention
+        lowest_mastery = heapq.nsmallest(5, mastery_levels, key=lambda x: x.current_mastery)
         
         # Focus areas: competencies with low mastery
-        for mastery_level in sorted_mastery[:5]:  # Top 5 lowest
+        for mastery_level in lowest_mastery:  # Top 5 lowest
             if mastery_level.current_mastery < 0.6:
                 focus_areas.append(mastery_level.competency_id)
         
@@ -434,8 +469,10 @@ async def generate_recommendations(
             if 0.3 <= mastery_level.current_mastery <= 0.7:
                 # Competencies in the learning zone
                 recommended_activities.append(f"practice_{mastery_level.competency_id}")
+                if len(recommended_activities) == MAX_RECOMMENDED_ACTIVITIES:
+                    break  # Limit recommendations
         
-        return recommended_activities[:10], focus_areas  # Limit recommendations
+        return recommended_activities, focus_areas
         
     except Exception as e:
         logger.error(f"Error generating recommendations: {str(e)}")
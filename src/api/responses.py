@@ -0,0 +1,16 @@
+"""
+Response classes shared by the API routers.
+"""
+
+from typing import Any
+
+from fastapi.responses import ORJSONResponse as _BaseORJSONResponse
+
+from ..models._json import dumps
+
+
+class ORJSONResponse(_BaseORJSONResponse):
+    """ORJSONResponse that also encodes ObjectId values."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
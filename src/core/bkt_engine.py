@@ -10,11 +10,18 @@ from typing import List, Dict, Tuple, Optional
 from datetime import datetime, timedelta
 import logging
 
+import numpy as np
+
+from .diagnostics import compute_diagnostics, MISSING_OBSERVATION, MAX_SEQUENCE_STEPS
 from ..models.mastery import (
     LearnerInteraction, 
     MasteryLevel, 
+    MasteryLevelBatch,
     BKTParameters,
-    MicroCompetency
+    BKTDiagnostics,
+    MicroCompetency,
+    RECENT_PERFORMANCE_WINDOW,
+    get_bkt_parameters
 )
 
 logger = logging.getLogger(__name__)
@@ -30,7 +37,7 @@ class BKTEngine:
     
     def __init__(self):
         """Initialize the BKT engine."""
-        self.default_parameters = BKTParameters()
+        self.default_parameters = get_bkt_parameters()
     
     def update_mastery(
         self, 
@@ -72,7 +79,7 @@ class BKTEngine:
             )
             
             # Check if mastery threshold is reached
-            self._check_mastery_threshold(updated_mastery)
+            self._check_mastery_threshold(updated_mastery, updated_mastery.updated_at)
             
             logger.info(
                 f"Updated mastery for learner {current_mastery.learner_id}, "
@@ -129,23 +136,20 @@ class BKTEngine:
         Returns:
             Updated probability of mastery
         """
-        # BKT update formulas
+        slip = params.slip_probability
+        guess = params.guess_probability
+        
+        # BKT update formulas; the numerator is also the first denominator term
         if is_correct:
             # P(L_n+1 = 1 | correct) = 
             # [P(L_n = 1) * (1 - P(S))] / [P(L_n = 1) * (1 - P(S)) + (1 - P(L_n = 1)) * P(G)]
-            numerator = p_mastery_before * (1 - params.slip_probability)
-            denominator = (
-                p_mastery_before * (1 - params.slip_probability) + 
-                (1 - p_mastery_before) * params.guess_probability
-            )
+            numerator = p_mastery_before * (1 - slip)
+            denominator = numerator + (1 - p_mastery_before) * guess
         else:
             # P(L_n+1 = 1 | incorrect) = 
             # [P(L_n = 1) * P(S)] / [P(L_n = 1) * P(S) + (1 - P(L_n = 1)) * (1 - P(G))]
-            numerator = p_mastery_before * params.slip_probability
-            denominator = (
-                p_mastery_before * params.slip_probability + 
-                (1 - p_mastery_before) * (1 - params.guess_probability)
-            )
+            numerator = p_mastery_before * slip
+            denominator = numerator + (1 - p_mastery_before) * (1 - guess)
         
         # Avoid division by zero
         if denominator == 0:
@@ -163,6 +167,63 @@ class BKTEngine:
         # Ensure probability stays within [0, 1]
         return max(0.0, min(1.0, p_mastery_after))
     
+    def batch_bkt_update(
+        self, 
+        batch: MasteryLevelBatch, 
+        is_correct: np.ndarray
+    ) -> np.ndarray:
+        """
+        Apply the BKT update formula to every mastery level in a batch at once.
+        
+        Args:
+            batch: Mastery levels in column-oriented form
+            is_correct: Boolean array with one observation per mastery level
+            
+        Returns:
+            Array of updated mastery probabilities
+        """
+        return self.update_mastery_arrays(
+            batch.current_mastery, is_correct, batch.slip, batch.guess, batch.learn
+        )
+    
+    def update_mastery_arrays(
+        self, 
+        priors: np.ndarray, 
+        is_correct: np.ndarray, 
+        slip, 
+        guess, 
+        learn
+    ) -> np.ndarray:
+        """
+        Apply the BKT update formula elementwise over NumPy arrays.
+        
+        Args:
+            priors: Mastery probabilities before the observation
+            is_correct: Boolean array with one observation per prior
+            slip, guess, learn: BKT parameters, as scalars or arrays
+                broadcastable against ``priors``
+            
+        Returns:
+            Array of updated mastery probabilities
+        """
+        priors = np.asarray(priors, dtype=np.float64)
+        is_correct = np.asarray(is_correct, dtype=bool)
+        
+        # Same operation order as _bkt_update, so results match it exactly
+        numerator = np.where(is_correct, priors * (1 - slip), priors * slip)
+        denominator = numerator + np.where(
+            is_correct,
+            (1 - priors) * guess,
+            (1 - priors) * (1 - guess)
+        )
+        
+        # Where the denominator is zero keep the previous mastery, as _bkt_update does
+        valid = denominator != 0
+        posterior = np.divide(numerator, denominator, out=np.zeros_like(denominator), where=valid)
+        updated = np.where(valid, posterior + (1 - posterior) * learn, priors)
+        
+        return np.clip(updated, 0.0, 1.0)
+    
     def _update_performance_stats(
         self, 
         current_mastery: MasteryLevel, 
@@ -180,9 +241,28 @@ class BKTEngine:
         Returns:
             Updated mastery level with new statistics
         """
-        # Create a copy to avoid modifying the original
-        updated = current_mastery.copy(deep=True)
+        # Copy to avoid modifying the original; only recent_performance is
+        # mutable, so the shared BKT parameters are not duplicated
+        updated = current_mastery.copy(
+            update={"recent_performance": list(current_mastery.recent_performance)}
+        )
+        self._apply_interaction_stats(updated, interaction, new_mastery_prob)
+        return updated
+    
+    def _apply_interaction_stats(
+        self, 
+        updated: MasteryLevel, 
+        interaction: LearnerInteraction, 
+        new_mastery_prob: float
+    ) -> None:
+        """
+        Record one interaction on a mastery level that the caller owns.
         
+        Args:
+            updated: Mastery level to update in place
+            interaction: New interaction
+            new_mastery_prob: Updated mastery probability
+        """
         # Update mastery probability
         updated.current_mastery = new_mastery_prob
         
@@ -203,31 +283,35 @@ class BKTEngine:
                     weight * interaction.score
                 )
         
-        # Update recent performance (keep last 10 scores)
+        # Update recent performance (keep last 10 scores), trimming in place
         if interaction.score is not None:
-            updated.recent_performance.append(interaction.score)
-            if len(updated.recent_performance) > 10:
-                updated.recent_performance = updated.recent_performance[-10:]
+            recent = updated.recent_performance
+            recent.append(interaction.score)
+            if len(recent) > RECENT_PERFORMANCE_WINDOW:
+                del recent[0]
         
         # Update timestamps
         if updated.first_interaction is None:
             updated.first_interaction = interaction.completed_at
         updated.last_interaction = interaction.completed_at
         updated.updated_at = datetime.utcnow()
-        
-        return updated
     
-    def _check_mastery_threshold(self, mastery_level: MasteryLevel) -> None:
+    def _check_mastery_threshold(
+        self, 
+        mastery_level: MasteryLevel, 
+        achieved_at: datetime
+    ) -> None:
         """
         Check if mastery threshold has been reached and update accordingly.
         
         Args:
             mastery_level: Mastery level to check
+            achieved_at: Timestamp recorded if mastery is reached now
         """
         if (mastery_level.current_mastery >= mastery_level.mastery_threshold and 
             not mastery_level.is_mastered):
             mastery_level.is_mastered = True
-            mastery_level.mastery_achieved_at = datetime.utcnow()
+            mastery_level.mastery_achieved_at = achieved_at
             logger.info(
                 f"Mastery achieved for learner {mastery_level.learner_id}, "
                 f"competency {mastery_level.competency_id}"
@@ -241,6 +325,10 @@ class BKTEngine:
         """
         Update multiple mastery levels based on multiple interactions.
         
+        The BKT posterior is computed step by step for all mastery levels at
+        once with batch_bkt_update; the per-interaction statistics are then
+        recorded on one copy of each mastery level.
+        
         Args:
             mastery_levels: List of current mastery levels
             interactions: List of new interactions
@@ -257,7 +345,7 @@ class BKTEngine:
             for ml in mastery_levels
         }
         
-        updated_mastery_levels = []
+        pending = []
         
         for (learner_id, competency_id), interaction_list in interaction_groups.items():
             current_mastery = mastery_lookup.get((learner_id, competency_id))
@@ -269,15 +357,90 @@ class BKTEngine:
                 )
                 continue
             
-            # Apply interactions sequentially
-            updated_mastery = current_mastery
-            for interaction in sorted(interaction_list, key=lambda x: x.completed_at):
-                updated_mastery = self.update_mastery(updated_mastery, interaction)
-            
-            updated_mastery_levels.append(updated_mastery)
+            pending.append((current_mastery, sorted(interaction_list, key=lambda x: x.completed_at)))
+        
+        if not pending:
+            return []
+        
+        # Longest histories first, so the levels still active at a step are a prefix
+        order = sorted(range(len(pending)), key=lambda i: len(pending[i][1]), reverse=True)
+        histories = [pending[i][1] for i in order]
+        batch = MasteryLevelBatch.from_mastery_levels([pending[i][0] for i in order])
+        
+        # step_mastery[step][row] is the mastery of row after its step-th interaction
+        step_mastery = []
+        active = len(order)
+        for step in range(len(histories[0])):
+            while len(histories[active - 1]) <= step:
+                active -= 1
+            is_correct = np.fromiter(
+                (self._determine_correctness(history[step]) for history in histories[:active]),
+                dtype=bool,
+                count=active
+            )
+            batch.current_mastery[:active] = self.batch_bkt_update(batch[:active], is_correct)
+            step_mastery.append(batch.current_mastery[:active].tolist())
+        
+        updated_mastery_levels = [None] * len(pending)
+        
+        for row, index in enumerate(order):
+            current_mastery = pending[index][0]
+            updated_mastery = current_mastery.copy(
+                update={"recent_performance": list(current_mastery.recent_performance)}
+            )
+            for step, interaction in enumerate(histories[row]):
+                self._apply_interaction_stats(updated_mastery, interaction, step_mastery[step][row])
+                self._check_mastery_threshold(updated_mastery, updated_mastery.updated_at)
+            updated_mastery_levels[index] = updated_mastery
+        
+        logger.info(
+            f"Batch-updated {len(pending)} mastery levels from "
+            f"{len(interactions)} interactions"
+        )
         
         return updated_mastery_levels
     
+    def diagnose_parameters(
+        self,
+        competency_id: str,
+        interactions: List[LearnerInteraction],
+        params: Optional[BKTParameters] = None,
+        max_steps: int = MAX_SEQUENCE_STEPS
+    ) -> BKTDiagnostics:
+        """
+        Score BKT parameters against the recorded interactions for a competency.
+        
+        Each learner's interactions become one chronological row of
+        observations, padded with missing steps to the longest sequence.
+        Every row is scored from the prior, so each learner's interactions
+        must start at their first one for the competency (as returned by
+        MasteryRepository.get_competency_histories). Rows are truncated to
+        their first ``max_steps`` interactions, so one long history cannot
+        inflate the dense matrix for every other learner.
+        
+        Args:
+            competency_id: Competency the interactions are scored for
+            interactions: Interactions tagged with the competency
+            params: Parameters to evaluate (defaults to the engine defaults)
+            max_steps: Maximum number of interactions scored per learner
+            
+        Returns:
+            Fit diagnostics for the parameters
+        """
+        sequences = [
+            [self._determine_correctness(interaction)
+             for interaction in sorted(interaction_list, key=lambda x: x.completed_at)[:max_steps]]
+            for (_, group_competency_id), interaction_list in self._group_interactions(interactions).items()
+            if group_competency_id == competency_id
+        ]
+        
+        num_steps = max((len(sequence) for sequence in sequences), default=0)
+        observations = np.full((len(sequences), num_steps), MISSING_OBSERVATION, dtype=np.int8)
+        for row, sequence in enumerate(sequences):
+            observations[row, :len(sequence)] = sequence
+        
+        return BKTDiagnostics(**compute_diagnostics(observations, params or self.default_parameters))
+    
     def _group_interactions(
         self, 
         interactions: List[LearnerInteraction]
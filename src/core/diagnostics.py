@@ -0,0 +1,332 @@
+"""
+BKT model diagnostics.
+
+This module computes goodness-of-fit statistics for a set of BKT parameters
+over a matrix of learner observations. The forward pass is vectorized across
+learners and, when JAX is installed, JIT-compiled with ``jax.lax.scan``.
+Both paths compute in float64 so they return the same statistics. The
+precision/recall sweep and the bootstrap intervals are NumPy reductions over
+the forward pass output, so they never re-run the model.
+"""
+
+import logging
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..models.mastery import BKTParameters
+
+try:
+    import jax
+    import jax.numpy as jnp
+except ImportError:  # pragma: no cover - JAX is an optional accelerator
+    jax = None
+    jnp = None
+else:
+    # JAX defaults to float32; the kernel must match the NumPy path
+    jax.config.update("jax_enable_x64", True)
+
+logger = logging.getLogger(__name__)
+
+# Marker for a step where the learner produced no observation
+MISSING_OBSERVATION = -1
+
+# Longest per-learner sequence scored; later steps are dropped so the dense
+# observation matrix stays bounded by learners x this many steps
+MAX_SEQUENCE_STEPS = 200
+
+# Number of free BKT parameters (P(L0), P(T), P(G), P(S))
+NUM_PARAMETERS = 4
+
+# Decision thresholds swept for the precision/recall curve
+PRECISION_RECALL_THRESHOLDS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9)
+
+# Number of learner resamples used for the bootstrap confidence intervals
+DEFAULT_BOOTSTRAP_SAMPLES = 200
+
+# Coverage of the bootstrap confidence intervals
+CONFIDENCE_LEVEL = 0.95
+
+# Upper bound on resample-weight entries held in memory at once
+BOOTSTRAP_CHUNK_ELEMENTS = 1_000_000
+
+# Smallest padded dimension passed to the JAX kernel
+MIN_JAX_BUCKET = 16
+
+
+def _forward_step(xp, p_mastery, obs, prior, learn, slip, guess):
+    """
+    Apply one BKT step to every learner at once.
+
+    Args:
+        xp: Array module (``numpy`` or ``jax.numpy``)
+        p_mastery: Current mastery probability per learner
+        obs: Observation per learner (1 correct, 0 incorrect, -1 missing)
+        prior, learn, slip, guess: BKT parameters
+
+    Returns:
+        Tuple of (next mastery, predicted P(correct), log-likelihood term)
+    """
+    observed = obs >= 0
+    correct = obs == 1
+
+    p_correct = p_mastery * (1 - slip) + (1 - p_mastery) * guess
+    # Keeps log() finite when a parameter pins a probability to 0 or 1. The
+    # margin follows the dtype, since 1 - 1e-12 rounds to 1.0 in float32.
+    epsilon = xp.finfo(p_correct.dtype).eps
+    p_correct = xp.clip(p_correct, epsilon, 1 - epsilon)
+
+    numerator = xp.where(correct, p_mastery * (1 - slip), p_mastery * slip)
+    denominator = xp.where(correct, p_correct, 1 - p_correct)
+    posterior = numerator / denominator
+    # Missing steps are not practice opportunities, so mastery carries over
+    next_mastery = xp.where(observed, posterior + (1 - posterior) * learn, p_mastery)
+
+    log_term = xp.where(correct, xp.log(p_correct), xp.log(1 - p_correct))
+    log_term = xp.where(observed, log_term, 0.0)
+
+    return next_mastery, p_correct, log_term
+
+
+def _forward_numpy(observations: np.ndarray, params: np.ndarray):
+    """Run the forward pass with NumPy, looping over time steps."""
+    prior, learn, guess, slip = params
+    num_learners, num_steps = observations.shape
+
+    p_mastery = np.full(num_learners, prior, dtype=np.float64)
+    predictions = np.empty((num_learners, num_steps), dtype=np.float64)
+    log_terms = np.empty((num_learners, num_steps), dtype=np.float64)
+
+    for t in range(num_steps):
+        p_mastery, predictions[:, t], log_terms[:, t] = _forward_step(
+            np, p_mastery, observations[:, t], prior, learn, slip, guess
+        )
+
+    return predictions, log_terms
+
+
+if jax is not None:
+
+    @jax.jit
+    def _forward_jax(observations, params):
+        """Run the forward pass with JAX, scanning over time steps."""
+        prior, learn, guess, slip = params
+
+        def step(p_mastery, obs):
+            next_mastery, p_correct, log_term = _forward_step(
+                jnp, p_mastery, obs, prior, learn, slip, guess
+            )
+            return next_mastery, (p_correct, log_term)
+
+        initial = jnp.full(observations.shape[0], prior, dtype=jnp.float64)
+        _, (predictions, log_terms) = jax.lax.scan(step, initial, observations.T)
+        return predictions.T, log_terms.T
+
+
+def _bucket_size(size: int) -> int:
+    """Round a dimension up to the next power of two, at least MIN_JAX_BUCKET."""
+    return max(MIN_JAX_BUCKET, 1 << (size - 1).bit_length())
+
+
+def _pad_to_bucket(observations: np.ndarray) -> np.ndarray:
+    """
+    Pad an observation matrix with missing steps up to bucketed dimensions.
+
+    ``jax.jit`` compiles once per input shape, so padding to a handful of
+    bucket shapes keeps requests from recompiling the kernel. Padded rows and
+    trailing steps are unobserved, so they leave the real rows unchanged.
+    """
+    num_learners, num_steps = observations.shape
+    padded = np.full(
+        (_bucket_size(num_learners), _bucket_size(num_steps)),
+        MISSING_OBSERVATION,
+        dtype=observations.dtype
+    )
+    padded[:num_learners, :num_steps] = observations
+    return padded
+
+
+def _precision_recall_sweep(
+    outcomes: np.ndarray,
+    predicted: np.ndarray,
+    thresholds: Sequence[float]
+) -> List[Dict[str, float]]:
+    """
+    Compute precision and recall of "correct" predictions at each threshold.
+
+    Args:
+        outcomes: Observed responses (1 correct, 0 incorrect)
+        predicted: Predicted P(correct) for each response
+        thresholds: Decision thresholds to sweep
+
+    Returns:
+        One dictionary per threshold with threshold, precision and recall
+    """
+    cutoffs = np.asarray(thresholds, dtype=np.float64)
+    actual = outcomes == 1
+    # Rows are thresholds, columns are responses
+    predicted_positive = predicted[np.newaxis, :] >= cutoffs[:, np.newaxis]
+    true_positives = (predicted_positive & actual).sum(axis=1)
+    predicted_counts = predicted_positive.sum(axis=1)
+    actual_count = actual.sum()
+
+    precision = np.divide(
+        true_positives, predicted_counts,
+        out=np.zeros(len(cutoffs)), where=predicted_counts > 0
+    )
+    recall = true_positives / actual_count if actual_count > 0 else np.zeros(len(cutoffs))
+
+    return [
+        {"threshold": float(t), "precision": float(p), "recall": float(r)}
+        for t, p, r in zip(cutoffs, precision, recall)
+    ]
+
+
+def _bootstrap_intervals(
+    log_terms: np.ndarray,
+    squared_errors: np.ndarray,
+    hits: np.ndarray,
+    observed: np.ndarray,
+    num_samples: int,
+    seed: Optional[int]
+) -> Dict[str, List[float]]:
+    """
+    Bootstrap confidence intervals for the fit statistics by resampling learners.
+
+    Learners are independent given the parameters, so each resample only
+    re-weights per-learner totals instead of re-running the forward pass.
+
+    Args:
+        log_terms: Per-step log-likelihood terms, zero where missing
+        squared_errors: Per-step squared residuals, zero where missing
+        hits: Per-step correct predictions, zero where missing
+        observed: Mask of observed steps
+        num_samples: Number of learner resamples
+        seed: Seed for the resampling generator
+
+    Returns:
+        Dictionary mapping each statistic to its [lower, upper] bounds
+    """
+    per_learner = np.stack([
+        log_terms.sum(axis=1),
+        squared_errors.sum(axis=1),
+        hits.sum(axis=1),
+        observed.sum(axis=1)
+    ], axis=1)
+
+    rng = np.random.default_rng(seed)
+    num_learners = per_learner.shape[0]
+    uniform = np.full(num_learners, 1 / num_learners)
+    chunk_size = max(1, BOOTSTRAP_CHUNK_ELEMENTS // num_learners)
+
+    # A resample is fully described by how often each learner was drawn, so
+    # its totals are a weighted sum of the per-learner rows. Drawing the
+    # weights in chunks bounds memory at chunk_size x learners.
+    totals = np.empty((num_samples, per_learner.shape[1]), dtype=np.float64)
+    for start in range(0, num_samples, chunk_size):
+        stop = min(start + chunk_size, num_samples)
+        weights = rng.multinomial(num_learners, uniform, size=stop - start)
+        totals[start:stop] = weights @ per_learner
+    log_likelihood, squared_error, hit_count, counts = totals.T
+
+    # Resamples that drew only unobserved learners carry no information
+    valid = counts > 0
+    statistics = {
+        "log_likelihood": log_likelihood[valid],
+        "rmse": np.sqrt(squared_error[valid] / counts[valid]),
+        "accuracy": hit_count[valid] / counts[valid]
+    }
+
+    tail = (1 - CONFIDENCE_LEVEL) / 2 * 100
+    return {
+        name: [float(bound) for bound in np.percentile(values, [tail, 100 - tail])]
+        for name, values in statistics.items()
+    }
+
+
+def compute_diagnostics(
+    observations: Any,
+    params: BKTParameters,
+    use_jax: bool = True,
+    thresholds: Sequence[float] = PRECISION_RECALL_THRESHOLDS,
+    num_bootstrap: int = DEFAULT_BOOTSTRAP_SAMPLES,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Compute fit diagnostics for BKT parameters over learner observations.
+
+    Args:
+        observations: Integer array of shape (learners, steps) holding
+            1 for correct, 0 for incorrect and -1 for missing steps
+        params: BKT parameters to evaluate
+        use_jax: Use the JIT-compiled JAX kernel when JAX is available
+        thresholds: Decision thresholds for the precision/recall sweep
+        num_bootstrap: Number of learner resamples for the confidence
+            intervals; 0 skips the bootstrap
+        seed: Seed for the bootstrap resampling
+
+    Returns:
+        Dictionary of diagnostics suitable for populating ``BKTDiagnostics``
+    """
+    obs = np.asarray(observations, dtype=np.int8)
+    if obs.ndim != 2:
+        raise ValueError("observations must be a 2-D array of shape (learners, steps)")
+
+    observed = obs >= 0
+    num_observations = int(observed.sum())
+
+    if num_observations == 0:
+        return {
+            "log_likelihood": 0.0,
+            "aic": 0.0,
+            "bic": 0.0,
+            "rmse": 0.0,
+            "accuracy": 0.0,
+            "num_observations": 0,
+            "precision_recall": [],
+            "confidence_intervals": {}
+        }
+
+    param_vector = np.array([
+        params.prior_knowledge,
+        params.learning_rate,
+        params.guess_probability,
+        params.slip_probability
+    ], dtype=np.float64)
+
+    if use_jax and jax is not None:
+        num_learners, num_steps = obs.shape
+        predictions, log_terms = _forward_jax(
+            jnp.asarray(_pad_to_bucket(obs)), jnp.asarray(param_vector)
+        )
+        predictions = np.asarray(predictions)[:num_learners, :num_steps]
+        log_terms = np.asarray(log_terms)[:num_learners, :num_steps]
+    else:
+        predictions, log_terms = _forward_numpy(obs, param_vector)
+
+    log_likelihood = float(log_terms.sum())
+
+    outcomes = obs[observed]
+    predicted = predictions[observed]
+    residuals = outcomes - predicted
+
+    diagnostics = {
+        "log_likelihood": log_likelihood,
+        "aic": 2 * NUM_PARAMETERS - 2 * log_likelihood,
+        "bic": NUM_PARAMETERS * math.log(num_observations) - 2 * log_likelihood,
+        "rmse": float(np.sqrt(np.mean(residuals ** 2))),
+        "accuracy": float(np.mean((predicted >= 0.5) == (outcomes == 1))),
+        "num_observations": num_observations,
+        "precision_recall": _precision_recall_sweep(outcomes, predicted, thresholds),
+        "confidence_intervals": {}
+    }
+
+    if num_bootstrap > 0:
+        squared_errors = np.where(observed, (obs - predictions) ** 2, 0.0)
+        hits = observed & ((predictions >= 0.5) == (obs == 1))
+        diagnostics["confidence_intervals"] = _bootstrap_intervals(
+            log_terms, squared_errors, hits, observed, num_bootstrap, seed
+        )
+
+    return diagnostics
@@ -5,6 +5,7 @@ This module handles MongoDB connection setup and provides database instances
 for the adaptive learning system.
 """
 
+import asyncio
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.errors import ConnectionFailure
@@ -13,12 +14,57 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Warm sockets kept open when MONGODB_MIN_POOL_SIZE is not set
+DEFAULT_MIN_POOL_SIZE = 10
+
+
+def mongo_client_options() -> dict:
+    """Connection and pool options for Motor clients, overridable via environment"""
+    max_pool_size = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+    min_pool_size = os.getenv("MONGODB_MIN_POOL_SIZE")
+    
+    # pymongo rejects a minimum above the maximum, so the default follows a
+    # small maximum and an explicit conflict is reported by variable name
+    if min_pool_size is None:
+        min_pool_size = min(DEFAULT_MIN_POOL_SIZE, max_pool_size)
+    else:
+        min_pool_size = int(min_pool_size)
+        if min_pool_size > max_pool_size:
+            raise ValueError(
+                f"MONGODB_MIN_POOL_SIZE ({min_pool_size}) must not exceed "
+                f"MONGODB_MAX_POOL_SIZE ({max_pool_size})"
+            )
+    
+    return dict(
+        serverSelectionTimeoutMS=5000,  # 5 second timeout
+        connectTimeoutMS=10000,         # 10 second connection timeout
+        socketTimeoutMS=20000,          # 20 second socket timeout
+        maxPoolSize=max_pool_size,
+        minPoolSize=min_pool_size,      # Keep warm sockets open
+        maxIdleTimeMS=int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "60000")),
+        waitQueueTimeoutMS=int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "10000")),
+        retryWrites=True                # Enable retryable writes
+    )
+
+
 class Database:
     """Database connection manager"""
     
     def __init__(self):
         self.client: AsyncIOMotorClient = None
         self.database = None
+        self._connect_lock: asyncio.Lock = None
+        self._connect_lock_loop = None
+    
+    def connect_lock(self) -> asyncio.Lock:
+        """Lock serializing connect attempts, created in the running event loop"""
+        # An asyncio.Lock binds to the loop it is first used in, so a lock
+        # left over from another loop (e.g. a restarted app) is replaced
+        loop = asyncio.get_running_loop()
+        if self._connect_lock is None or self._connect_lock_loop is not loop:
+            self._connect_lock = asyncio.Lock()
+            self._connect_lock_loop = loop
+        return self._connect_lock
         
     async def connect_to_mongo(self):
         """Create database connection"""
@@ -27,21 +73,20 @@ class Database:
             if not mongodb_uri:
                 raise ValueError("MONGODB_URI environment variable is not set")
             
-            self.client = AsyncIOMotorClient(
-                mongodb_uri,
-                serverSelectionTimeoutMS=5000,  # 5 second timeout
-                connectTimeoutMS=10000,         # 10 second connection timeout
-                socketTimeoutMS=20000,          # 20 second socket timeout
-                maxPoolSize=10,                 # Connection pool size
-                retryWrites=True                # Enable retryable writes
-            )
+            client = AsyncIOMotorClient(mongodb_uri, **mongo_client_options())
             
-            # Test the connection
-            await self.client.admin.command('ping')
+            # Test the connection before publishing the client, so a failed
+            # connect leaves no unusable client behind for callers to reuse
+            try:
+                await client.admin.command('ping')
+            except Exception:
+                client.close()
+                raise
             
             # Get database name from URI or use default
             database_name = os.getenv("DATABASE_NAME", "adaptive_learning_system")
-            self.database = self.client[database_name]
+            self.client = client
+            self.database = client[database_name]
             
             logger.info(f"Connected to MongoDB database: {database_name}")
             
@@ -56,11 +101,15 @@ class Database:
         """Close database connection"""
         if self.client:
             self.client.close()
+            self.client = None
+            self.database = None
             logger.info("Disconnected from MongoDB")
+        self._connect_lock = None
+        self._connect_lock_loop = None
     
     def get_collection(self, collection_name: str):
         """Get a collection from the database"""
-        if not self.database:
+        if self.database is None:
             raise RuntimeError("Database not connected")
         return self.database[collection_name]
 
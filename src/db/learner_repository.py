@@ -5,6 +5,7 @@ This module provides data access layer for learner profile operations
 including CRUD operations and profile management functionality.
 """
 
+import re
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from bson import ObjectId
@@ -15,7 +16,8 @@ from ..models.learner_profile import (
     LearnerProfile,
     LearnerProfileCreate,
     LearnerProfileUpdate,
-    LearnerProfileResponse
+    LearnerProfileResponse,
+    pack_accessibility_features
 )
 from ..utils.security import get_password_hash, verify_password
 
@@ -49,6 +51,7 @@ class LearnerRepository:
             profile_dict["created_at"] = datetime.utcnow()
             profile_dict["updated_at"] = datetime.utcnow()
             profile_dict["profile_completion_percentage"] = self._calculate_completion_percentage(profile_dict)
+            self._pack_accessibility_settings(profile_dict)
             
             # Insert into database
             result = await self.collection.insert_one(profile_dict)
@@ -108,6 +111,7 @@ class LearnerRepository:
             
             # Add updated timestamp
             update_dict["updated_at"] = datetime.utcnow()
+            self._pack_accessibility_settings(update_dict)
             
             # Update the profile
             result = await self.collection.update_one(
@@ -188,7 +192,6 @@ class LearnerRepository:
                 query["programming_experience.overall_experience"] = filters["experience_level"]
             if "search_text" in filters:
                 # Text search in name and email - escape regex special characters
-                import re
                 search_text = re.escape(filters["search_text"])
                 query["$or"] = [
                     {"first_name": {"$regex": search_text, "$options": "i"}},
@@ -233,6 +236,12 @@ class LearnerRepository:
         except Exception:
             return False
     
+    def _pack_accessibility_settings(self, profile_data: Dict[str, Any]) -> None:
+        """Store enabled accessibility features as a compact bit mask"""
+        settings = profile_data.get("accessibility_settings")
+        if settings and "enabled_features" in settings:
+            settings["accessibility_flags"] = pack_accessibility_features(settings.pop("enabled_features"))
+    
     def _calculate_completion_percentage(self, profile_data: Dict[str, Any]) -> float:
         """Calculate profile completion percentage"""
         total_fields = 0
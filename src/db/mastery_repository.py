@@ -9,7 +9,7 @@ import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo import ASCENDING, DESCENDING
+from pymongo import ASCENDING, DESCENDING, ReplaceOne
 from bson import ObjectId
 
 from ..models.mastery import (
@@ -17,11 +17,15 @@ from ..models.mastery import (
     MasteryLevel,
     MicroCompetency,
     ProgressReport,
-    BKTParameters
+    BKTParameters,
+    get_bkt_parameters
 )
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of operations sent in one bulk write
+BULK_WRITE_CHUNK_SIZE = 1000
+
 
 class MasteryRepository:
     """Repository for mastery tracking data operations."""
@@ -139,8 +143,7 @@ class MasteryRepository:
             
             interactions = []
             async for doc in cursor:
-                doc["_id"] = str(doc["_id"])
-                interactions.append(LearnerInteraction(**doc))
+                interactions.append(LearnerInteraction.from_mongo(doc))
             
             return interactions
             
@@ -171,8 +174,7 @@ class MasteryRepository:
             
             interactions = []
             async for doc in cursor:
-                doc["_id"] = str(doc["_id"])
-                interactions.append(LearnerInteraction(**doc))
+                interactions.append(LearnerInteraction.from_mongo(doc))
             
             return interactions
             
@@ -180,6 +182,42 @@ class MasteryRepository:
             logger.error(f"Error getting interactions for competency {competency_id}: {str(e)}")
             raise
     
+    async def get_competency_histories(
+        self, 
+        competency_id: str, 
+        limit: Optional[int] = None
+    ) -> List[LearnerInteraction]:
+        """
+        Get interactions for a competency from the oldest onwards.
+        
+        Reading in ascending order means every learner in the result starts
+        at their first interaction with the competency, so a BKT forward pass
+        can start each sequence from the prior. The limit only cuts the end
+        of the learners' histories, never the start.
+        
+        Args:
+            competency_id: Competency identifier
+            limit: Maximum number of interactions to return
+            
+        Returns:
+            List of learner interactions in chronological order
+        """
+        try:
+            query = {"competency_ids": competency_id}
+            cursor = self.interactions_collection.find(query).sort("completed_at", ASCENDING)
+            if limit:
+                cursor = cursor.limit(limit)
+            
+            interactions = []
+            async for doc in cursor:
+                interactions.append(LearnerInteraction.from_mongo(doc))
+            
+            return interactions
+            
+        except Exception as e:
+            logger.error(f"Error getting interaction histories for competency {competency_id}: {str(e)}")
+            raise
+    
     async def get_recent_interactions(
         self, 
         hours: int = 24, 
@@ -205,8 +243,7 @@ class MasteryRepository:
             
             interactions = []
             async for doc in cursor:
-                doc["_id"] = str(doc["_id"])
-                interactions.append(LearnerInteraction(**doc))
+                interactions.append(LearnerInteraction.from_mongo(doc))
             
             return interactions
             
@@ -227,7 +264,7 @@ class MasteryRepository:
             ID of the saved mastery level
         """
         try:
-            mastery_dict = mastery_level.dict(by_alias=True, exclude_unset=True)
+            mastery_dict = self._mastery_level_to_doc(mastery_level)
             
             # Use upsert to update existing or create new
             filter_query = {
@@ -235,9 +272,6 @@ class MasteryRepository:
                 "competency_id": mastery_level.competency_id
             }
             
-            if "_id" in mastery_dict:
-                del mastery_dict["_id"]
-            
             result = await self.mastery_collection.replace_one(
                 filter_query, 
                 mastery_dict, 
@@ -281,8 +315,7 @@ class MasteryRepository:
             })
             
             if doc:
-                doc["_id"] = str(doc["_id"])
-                return MasteryLevel(**doc)
+                return MasteryLevel.from_mongo(doc)
             
             return None
             
@@ -290,6 +323,76 @@ class MasteryRepository:
             logger.error(f"Error getting mastery level: {str(e)}")
             raise
     
+    async def save_mastery_levels(self, mastery_levels: List[MasteryLevel]) -> int:
+        """
+        Save or update several mastery levels in a single bulk write.
+        
+        Args:
+            mastery_levels: Mastery levels to save
+            
+        Returns:
+            Number of documents inserted or modified
+        """
+        if not mastery_levels:
+            return 0
+        
+        try:
+            saved = 0
+            # Chunk large flushes so a single bulk write never buffers them all
+            for start in range(0, len(mastery_levels), BULK_WRITE_CHUNK_SIZE):
+                operations = [
+                    ReplaceOne(
+                        {
+                            "learner_id": mastery_level.learner_id,
+                            "competency_id": mastery_level.competency_id
+                        },
+                        self._mastery_level_to_doc(mastery_level),
+                        upsert=True
+                    )
+                    for mastery_level in mastery_levels[start:start + BULK_WRITE_CHUNK_SIZE]
+                ]
+                
+                result = await self.mastery_collection.bulk_write(operations, ordered=False)
+                saved += result.upserted_count + result.modified_count
+            
+            logger.info(f"Bulk saved {saved} mastery levels")
+            return saved
+            
+        except Exception as e:
+            logger.error(f"Error bulk saving mastery levels: {str(e)}")
+            raise
+    
+    async def get_mastery_levels(
+        self, 
+        learner_id: str, 
+        competency_ids: List[str]
+    ) -> Dict[str, MasteryLevel]:
+        """
+        Get mastery levels for a learner across several competencies in one query.
+        
+        Args:
+            learner_id: Learner identifier
+            competency_ids: Competency identifiers to fetch
+            
+        Returns:
+            Dictionary mapping competency ID to mastery level (missing IDs omitted)
+        """
+        try:
+            cursor = self.mastery_collection.find({
+                "learner_id": learner_id,
+                "competency_id": {"$in": competency_ids}
+            })
+            
+            mastery_levels = {}
+            async for doc in cursor:
+                mastery_levels[doc["competency_id"]] = MasteryLevel.from_mongo(doc)
+            
+            return mastery_levels
+            
+        except Exception as e:
+            logger.error(f"Error getting mastery levels for learner {learner_id}: {str(e)}")
+            raise
+    
     async def get_mastery_levels_by_learner(
         self, 
         learner_id: str
@@ -308,8 +411,7 @@ class MasteryRepository:
             
             mastery_levels = []
             async for doc in cursor:
-                doc["_id"] = str(doc["_id"])
-                mastery_levels.append(MasteryLevel(**doc))
+                mastery_levels.append(MasteryLevel.from_mongo(doc))
             
             return mastery_levels
             
@@ -345,7 +447,7 @@ class MasteryRepository:
                 learner_id=learner_id,
                 competency_id=competency_id,
                 current_mastery=initial_parameters.prior_knowledge if initial_parameters else 0.1,
-                bkt_parameters=initial_parameters or BKTParameters()
+                bkt_parameters=initial_parameters or get_bkt_parameters()
             )
             
             await self.save_mastery_level(mastery_level)
@@ -355,6 +457,33 @@ class MasteryRepository:
             logger.error(f"Error creating initial mastery level: {str(e)}")
             raise
     
+    def _mastery_level_to_doc(self, mastery_level: MasteryLevel) -> Dict[str, Any]:
+        """
+        Build the stored document for a mastery level from its field values.
+        
+        Reads the instance __dict__ directly instead of calling
+        dict(by_alias=True, exclude_unset=True), which recursively copies
+        every value. Only explicitly set fields are written, and the id is left
+        to the upsert filter.
+        
+        Args:
+            mastery_level: Mastery level to store
+            
+        Returns:
+            Document ready for replace_one/ReplaceOne
+        """
+        fields_set = mastery_level.__fields_set__
+        doc = {
+            name: value
+            for name, value in mastery_level.__dict__.items()
+            if name in fields_set and name != "id"
+        }
+        if "bkt_parameters" in doc:
+            doc["bkt_parameters"] = dict(doc["bkt_parameters"].__dict__)
+        if "recent_performance" in doc:
+            doc["recent_performance"] = list(doc["recent_performance"])
+        return doc
+    
     # Competency Operations
     
     async def save_competency(self, competency: MicroCompetency) -> str:
@@ -410,8 +539,7 @@ class MasteryRepository:
             doc = await self.competencies_collection.find_one({"competency_id": competency_id})
             
             if doc:
-                doc["_id"] = str(doc["_id"])
-                return MicroCompetency(**doc)
+                return MicroCompetency.from_mongo(doc)
             
             return None
             
@@ -443,8 +571,7 @@ class MasteryRepository:
             
             competencies = []
             async for doc in cursor:
-                doc["_id"] = str(doc["_id"])
-                competencies.append(MicroCompetency(**doc))
+                competencies.append(MicroCompetency.from_mongo(doc))
             
             return competencies
             
@@ -520,11 +647,32 @@ class MasteryRepository:
             Performance statistics dictionary
         """
         try:
-            # Aggregate performance data
+            stats = await self.get_competency_performance_stats_many([competency_id])
+            return stats[competency_id]
+                
+        except Exception as e:
+            logger.error(f"Error getting performance stats for competency {competency_id}: {str(e)}")
+            raise
+    
+    async def get_competency_performance_stats_many(
+        self, 
+        competency_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get performance statistics for several competencies in one aggregation.
+        
+        Args:
+            competency_ids: Competency identifiers
+            
+        Returns:
+            Dictionary mapping each competency ID to its statistics dictionary
+        """
+        try:
+            # Aggregate performance data, one group per competency
             pipeline = [
-                {"$match": {"competency_id": competency_id}},
+                {"$match": {"competency_id": {"$in": list(competency_ids)}}},
                 {"$group": {
-                    "_id": None,
+                    "_id": "$competency_id",
                     "total_learners": {"$sum": 1},
                     "mastered_learners": {
                         "$sum": {"$cond": [{"$eq": ["$is_mastered", True]}, 1, 0]}
@@ -537,28 +685,33 @@ class MasteryRepository:
                 }}
             ]
             
-            result = await self.mastery_collection.aggregate(pipeline).to_list(1)
+            results = await self.mastery_collection.aggregate(pipeline).to_list(None)
             
-            if result:
-                stats = result[0]
+            all_stats = {}
+            for stats in results:
+                competency_id = stats.pop("_id")
                 stats["mastery_rate"] = (
                     stats["mastered_learners"] / stats["total_learners"] * 100
                     if stats["total_learners"] > 0 else 0
                 )
-                del stats["_id"]
-                return stats
-            else:
-                return {
-                    "total_learners": 0,
-                    "mastered_learners": 0,
-                    "average_mastery": 0.0,
-                    "min_mastery": 0.0,
-                    "max_mastery": 0.0,
-                    "mastery_rate": 0.0,
-                    "total_interactions": 0,
-                    "average_interactions": 0.0
-                }
+                all_stats[competency_id] = stats
+            
+            # Competencies without mastery data get zeroed statistics
+            for competency_id in competency_ids:
+                if competency_id not in all_stats:
+                    all_stats[competency_id] = {
+                        "total_learners": 0,
+                        "mastered_learners": 0,
+                        "average_mastery": 0.0,
+                        "min_mastery": 0.0,
+                        "max_mastery": 0.0,
+                        "mastery_rate": 0.0,
+                        "total_interactions": 0,
+                        "average_interactions": 0.0
+                    }
+            
+            return all_stats
                 
         except Exception as e:
-            logger.error(f"Error getting performance stats for competency {competency_id}: {str(e)}")
-            raise
\ No newline at end of file
+            logger.error(f"Error getting performance stats for competencies {list(competency_ids)}: {str(e)}")
+            raise
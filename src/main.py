@@ -13,12 +13,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 
+# Load environment variables before importing modules that read them at import time
+load_dotenv()
+
 from .db.database import db
 from .db.learner_repository import LearnerRepository
 from .api.learner_profile_routes import router as learner_router
-
-# Load environment variables
-load_dotenv()
+from .api.responses import ORJSONResponse
 
 # Configure logging
 logging.basicConfig(
@@ -63,6 +64,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -0,0 +1,12 @@
+"""
+Enum value lookups shared by the Pydantic models.
+"""
+
+from enum import Enum
+from typing import Any, Dict, Type
+
+
+def value_map(enum_cls: Type[Enum]) -> Dict[Any, Enum]:
+    """Build a value -> member lookup for an enum class."""
+    return {member.value: member for member in enum_cls}
+
@@ -0,0 +1,21 @@
+"""
+Shared JSON encoding for API responses.
+"""
+
+import orjson
+from bson import ObjectId
+
+# Mirrors FastAPI's ORJSONResponse options; naive datetimes keep their offset-less ISO format
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj):
+    """Encode types orjson does not handle natively."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    """Serialize a value to JSON bytes in a single orjson pass."""
+    return orjson.dumps(obj, default=_default, option=_OPTIONS)
@@ -0,0 +1,30 @@
+"""
+Shared ObjectId field type for Pydantic models.
+"""
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+class PyObjectId(ObjectId):
+    """Custom ObjectId type for Pydantic models."""
+    
+    __slots__ = ()
+    
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, v):
+        if isinstance(v, ObjectId):
+            return v
+        try:
+            # A single parse; ObjectId.is_valid() would construct it a second time
+            return ObjectId(v)
+        except (InvalidId, TypeError):
+            raise ValueError("Invalid ObjectId")
+
+    @classmethod
+    def __modify_schema__(cls, field_schema):
+        field_schema.update(type="string")
@@ -5,29 +5,28 @@ This module defines the data models for learner profiles including demographics,
 learning preferences, prior experience, and accessibility settings.
 """
 
+import json
+import re
 from datetime import datetime
-from enum import Enum
+from enum import Enum, IntFlag
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field, EmailStr, validator
+from pydantic import BaseModel, Field, EmailStr, validator, root_validator
 from bson import ObjectId
 
+from ._objectid import PyObjectId
 
-class PyObjectId(ObjectId):
-    """Custom ObjectId type for Pydantic models"""
-    
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
 
-    @classmethod
-    def validate(cls, v):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid ObjectId")
-        return ObjectId(v)
+# Letters, digits, hyphens and underscores (at least one letter or digit)
+_USERNAME_RE = re.compile(r"[\w-]*[^\W_][\w-]*")
+
+# OpenAPI examples, read from disk the first time a schema is generated
+_SCHEMA_EXAMPLES_PATH = Path(__file__).with_name("schema_examples.json")
 
-    @classmethod
-    def __modify_schema__(cls, field_schema):
-        field_schema.update(type="string")
+# Character classes required in a password, accumulated as a bit mask
+_HAS_UPPER, _HAS_LOWER, _HAS_DIGIT = 1, 2, 4
+_HAS_ALL_CLASSES = _HAS_UPPER | _HAS_LOWER | _HAS_DIGIT
 
 
 class EducationLevel(str, Enum):
@@ -71,6 +70,54 @@ class AccessibilityPreference(str, Enum):
     CAPTIONS = "captions"
 
 
+@lru_cache(maxsize=None)
+def _load_schema_examples() -> Dict[str, Any]:
+    """Load the OpenAPI examples keyed by model name"""
+    with open(_SCHEMA_EXAMPLES_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def add_schema_example(schema: Dict[str, Any], model: type) -> None:
+    """
+    Attach a model's OpenAPI example to its generated schema
+    
+    Used as Config.schema_extra so the examples are only read when a schema is
+    actually generated (e.g. the first /openapi.json request), not at import.
+    """
+    example = _load_schema_examples().get(model.__name__)
+    if example is not None:
+        schema["example"] = example
+
+
+class AccessibilityFlag(IntFlag):
+    """Bit flags mirroring AccessibilityPreference for compact storage"""
+    SCREEN_READER = 1
+    HIGH_CONTRAST = 2
+    LARGE_TEXT = 4
+    KEYBOARD_NAVIGATION = 8
+    REDUCED_MOTION = 16
+    AUDIO_DESCRIPTIONS = 32
+    CAPTIONS = 64
+
+
+_ACCESSIBILITY_FLAG_MAP = {
+    AccessibilityFlag[preference.name]: preference for preference in AccessibilityPreference
+}
+
+
+def pack_accessibility_features(features: List[AccessibilityPreference]) -> int:
+    """Pack a list of accessibility preferences into an integer bit mask"""
+    flags = 0
+    for feature in features:
+        flags |= AccessibilityFlag[AccessibilityPreference(feature).name]
+    return int(flags)
+
+
+def unpack_accessibility_flags(flags: int) -> List[AccessibilityPreference]:
+    """Expand an accessibility bit mask into the legacy list of preferences"""
+    return [preference for flag, preference in _ACCESSIBILITY_FLAG_MAP.items() if flags & flag]
+
+
 class Demographics(BaseModel):
     """Demographic information for learner"""
     age: Optional[int] = Field(None, ge=13, le=120, description="Learner's age")
@@ -108,6 +155,14 @@ class AccessibilitySettings(BaseModel):
     motion_sensitivity: bool = Field(False, description="Sensitive to motion/animations")
     audio_enabled: bool = Field(True, description="Audio feedback enabled")
 
+    @root_validator(pre=True)
+    def unpack_stored_flags(cls, values):
+        """Translate the stored accessibility_flags mask back into enabled_features"""
+        if "accessibility_flags" in values:
+            values = dict(values)
+            values["enabled_features"] = unpack_accessibility_flags(values.pop("accessibility_flags") or 0)
+        return values
+
 
 class LearnerProfileBase(BaseModel):
     """Base learner profile model"""
@@ -131,7 +186,7 @@ class LearnerProfileBase(BaseModel):
     @validator('username')
     def validate_username(cls, v):
         """Validate username format"""
-        if v and not v.replace('_', '').replace('-', '').isalnum():
+        if v and not _USERNAME_RE.fullmatch(v):
             raise ValueError('Username can only contain letters, numbers, hyphens, and underscores')
         return v.lower() if v else v
 
@@ -145,11 +200,22 @@ class LearnerProfileCreate(LearnerProfileBase):
         """Validate password strength"""
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters long')
-        if not any(c.isupper() for c in v):
+        # Single pass over the password, stopping once every class has been seen
+        flags = 0
+        for c in v:
+            if c.isupper():
+                flags |= _HAS_UPPER
+            elif c.islower():
+                flags |= _HAS_LOWER
+            elif c.isdigit():
+                flags |= _HAS_DIGIT
+            if flags == _HAS_ALL_CLASSES:
+                break
+        if not flags & _HAS_UPPER:
             raise ValueError('Password must contain at least one uppercase letter')
-        if not any(c.islower() for c in v):
+        if not flags & _HAS_LOWER:
             raise ValueError('Password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in v):
+        if not flags & _HAS_DIGIT:
             raise ValueError('Password must contain at least one digit')
         return v
 
@@ -178,37 +244,7 @@ class LearnerProfile(LearnerProfileBase):
         allow_population_by_field_name = True
         arbitrary_types_allowed = True
         json_encoders = {ObjectId: str}
-        schema_extra = {
-            "example": {
-                "email": "learner@example.com",
-                "first_name": "John",
-                "last_name": "Doe",
-                "username": "johndoe",
-                "demographics": {
-                    "age": 25,
-                    "education_level": "bachelor",
-                    "country": "United States",
-                    "timezone": "America/New_York",
-                    "preferred_language": "en"
-                },
-                "learning_preferences": {
-                    "learning_styles": ["visual", "kinesthetic"],
-                    "session_duration_preference": 30,
-                    "difficulty_preference": "adaptive"
-                },
-                "programming_experience": {
-                    "overall_experience": "beginner",
-                    "languages_known": ["python", "javascript"],
-                    "years_of_experience": 1
-                },
-                "accessibility_settings": {
-                    "enabled_features": ["large_text"],
-                    "font_size_multiplier": 1.2
-                },
-                "goals": ["Learn data structures", "Prepare for interviews"],
-                "interests": ["algorithms", "web development"]
-            }
-        }
+        schema_extra = staticmethod(add_schema_example)
 
 
 class LearnerProfileResponse(BaseModel):
@@ -231,33 +267,4 @@ class LearnerProfileResponse(BaseModel):
     profile_completion_percentage: float
 
     class Config:
-        schema_extra = {
-            "example": {
-                "id": "507f1f77bcf86cd799439011",
-                "email": "learner@example.com",
-                "first_name": "John",
-                "last_name": "Doe",
-                "username": "johndoe",
-                "demographics": {
-                    "age": 25,
-                    "education_level": "bachelor",
-                    "country": "United States"
-                },
-                "learning_preferences": {
-                    "learning_styles": ["visual"],
-                    "session_duration_preference": 30
-                },
-                "programming_experience": {
-                    "overall_experience": "beginner",
-                    "languages_known": ["python"]
-                },
-                "accessibility_settings": {
-                    "enabled_features": [],
-                    "font_size_multiplier": 1.0
-                },
-                "goals": ["Learn data structures"],
-                "interests": ["algorithms"],
-                "is_active": True,
-                "profile_completion_percentage": 75.0
-            }
-        }
\ No newline at end of file
+        schema_extra = staticmethod(add_schema_example)
\ No newline at end of file
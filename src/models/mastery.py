@@ -5,29 +5,82 @@ This module defines Pydantic models for learner interactions, competencies,
 and mastery tracking data structures used in the Bayesian Knowledge Tracing system.
 """
 
+import sys
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from enum import Enum
-from pydantic import BaseModel, Field
+from weakref import WeakValueDictionary
+import numpy as np
+from pydantic import BaseModel, Field, validator
+from pydantic.fields import SHAPE_SINGLETON
 from bson import ObjectId
 
+from ._enums import value_map
+from ._objectid import PyObjectId
 
-class PyObjectId(ObjectId):
-    """Custom ObjectId type for Pydantic models."""
-    
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
+# Number of most recent scores kept in MasteryLevel.recent_performance
+RECENT_PERFORMANCE_WINDOW = 10
 
-    @classmethod
-    def validate(cls, v):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid ObjectId")
-        return ObjectId(v)
 
-    @classmethod
-    def __modify_schema__(cls, field_schema):
-        field_schema.update(type="string")
+# Generated from_mongo constructors, keyed by model class
+_fast_ctors: Dict[type, Any] = {}
+
+
+def _compile_fast_ctor(cls, converters: Optional[Dict[str, Callable[[Any], Any]]] = None):
+    """
+    Generate and attach a ``from_mongo`` constructor specialized to a model.
+    
+    The generated function skips the validator chain, so only use it for
+    documents read back from the database, never for user input. It is
+    unrolled per field once at import time (the way dataclasses generates
+    __init__), maps the stored ``_id`` onto ``id`` and resolves raw enum
+    values to their members.
+    
+    Args:
+        cls: Model class to generate the constructor for
+        converters: Optional per-field callables applied to stored values
+    """
+    ctor = _fast_ctors.get(cls)
+    if ctor is None:
+        namespace: Dict[str, Any] = {"object_setattr": object.__setattr__}
+        lines = ["def from_mongo(cls, doc):", "    values = {}", "    fields_set = set()"]
+        
+        for name, field in cls.__fields__.items():
+            value = "raw"
+            if converters and name in converters:
+                namespace[f"_convert_{name}"] = converters[name]
+                value = f"_convert_{name}(raw)"
+            elif (
+                field.shape == SHAPE_SINGLETON
+                and isinstance(field.type_, type)
+                and issubclass(field.type_, Enum)
+            ):
+                namespace[f"_map_{name}"] = value_map(field.type_)
+                value = f"_map_{name}.get(raw, raw)"
+            
+            keys = [field.alias] if field.alias == name else [field.alias, name]
+            for i, key in enumerate(keys):
+                lines.append(f"    {'if' if i == 0 else 'elif'} {key!r} in doc:")
+                lines.append(f"        raw = doc[{key!r}]")
+                lines.append(f"        values[{name!r}] = {value}")
+                lines.append(f"        fields_set.add({name!r})")
+            if not field.required:
+                namespace[f"_default_{name}"] = field.get_default
+                lines.append("    else:")
+                lines.append(f"        values[{name!r}] = _default_{name}()")
+        
+        lines += [
+            "    obj = cls.__new__(cls)",
+            "    object_setattr(obj, '__dict__', values)",
+            "    object_setattr(obj, '__fields_set__', fields_set)",
+            "    obj._init_private_attributes()",
+            "    return obj",
+        ]
+        exec("\n".join(lines), namespace)
+        ctor = _fast_ctors[cls] = namespace["from_mongo"]
+        cls.from_mongo = classmethod(ctor)
+    return ctor
 
 
 class ActivityType(str, Enum):
@@ -55,6 +108,19 @@ class DifficultyLevel(str, Enum):
     EXPERT = "expert"
 
 
+# Identifier fields repeated across many interactions, interned on load
+_INTERNED_ID_FIELDS = ("learner_id", "activity_id", "session_id", "competency_ids")
+
+
+def _intern_ids(v):
+    """Intern an identifier string, or a sequence of them as a tuple."""
+    if isinstance(v, str):
+        return sys.intern(v)
+    if isinstance(v, (list, tuple)):
+        return tuple(sys.intern(item) if isinstance(item, str) else item for item in v)
+    return v
+
+
 class MicroCompetency(BaseModel):
     """Represents a granular skill or knowledge component."""
     
@@ -83,7 +149,7 @@ class LearnerInteraction(BaseModel):
     activity_id: str = Field(..., description="Unique identifier for the activity")
     activity_type: ActivityType = Field(..., description="Type of activity")
     interaction_type: InteractionType = Field(..., description="Type of interaction")
-    competency_ids: List[str] = Field(..., description="List of competencies addressed in this interaction")
+    competency_ids: Tuple[str, ...] = Field(..., description="List of competencies addressed in this interaction")
     
     # Performance data
     score: Optional[float] = Field(None, ge=0.0, le=1.0, description="Normalized score (0.0 to 1.0)")
@@ -111,11 +177,87 @@ class LearnerInteraction(BaseModel):
 class BKTParameters(BaseModel):
     """Bayesian Knowledge Tracing parameters for a competency."""
     
+    __slots__ = ("__weakref__",)
+    
     prior_knowledge: float = Field(default=0.1, ge=0.0, le=1.0, description="P(L0) - Initial probability of knowing the skill")
     learning_rate: float = Field(default=0.3, ge=0.0, le=1.0, description="P(T) - Probability of learning the skill")
     slip_probability: float = Field(default=0.1, ge=0.0, le=1.0, description="P(S) - Probability of making a mistake despite knowing")
     guess_probability: float = Field(default=0.25, ge=0.0, le=1.0, description="P(G) - Probability of guessing correctly")
 
+    class Config:
+        frozen = True
+        copy_on_model_validation = "none"
+
+    def __deepcopy__(self, memo):
+        # Immutable value object, safe to share between copies
+        return self
+
+
+# Field order of the flyweight keys
+_BKT_PARAMETER_FIELDS = ("prior_knowledge", "learning_rate", "slip_probability", "guess_probability")
+
+# Shared BKTParameters instances keyed by parameter values
+_param_flyweight: "WeakValueDictionary[tuple, BKTParameters]" = WeakValueDictionary()
+
+
+def get_bkt_parameters(
+    prior_knowledge: float = 0.1,
+    learning_rate: float = 0.3,
+    slip_probability: float = 0.1,
+    guess_probability: float = 0.25
+) -> BKTParameters:
+    """
+    Get a shared BKTParameters instance for the given parameter values.
+    
+    Mastery levels for the same competency usually carry identical parameters,
+    so they can all reference one immutable instance instead of building a new
+    model per record.
+    """
+    key = (float(prior_knowledge), float(learning_rate), float(slip_probability), float(guess_probability))
+    params = _param_flyweight.get(key)
+    if params is None:
+        values = dict(zip(_BKT_PARAMETER_FIELDS, key))
+        if all(0.0 <= value <= 1.0 for value in key):
+            # All four fields are plain probabilities, so one range pass
+            # replaces the per-field validator chain
+            params = BKTParameters.construct(**values)
+        else:
+            # Out of range (or NaN): let the model raise a ValidationError
+            params = BKTParameters(**values)
+        _param_flyweight[key] = params
+    return params
+
+
+def _shared_bkt_parameters(v):
+    """Resolve a stored parameter dict to the shared BKTParameters instance."""
+    if isinstance(v, dict):
+        return get_bkt_parameters(**v)
+    return v
+
+
+class PrecisionRecallPoint(BaseModel):
+    """Precision and recall of predicted correctness at one decision threshold."""
+    
+    threshold: float = Field(..., ge=0.0, le=1.0, description="Predicted P(correct) cutoff")
+    precision: float = Field(..., ge=0.0, le=1.0, description="Fraction of predicted-correct responses that were correct")
+    recall: float = Field(..., ge=0.0, le=1.0, description="Fraction of correct responses predicted correct")
+
+
+class BKTDiagnostics(BaseModel):
+    """Goodness-of-fit diagnostics for a set of BKT parameters."""
+    
+    log_likelihood: float = Field(..., description="Log-likelihood of the observed responses")
+    aic: float = Field(..., description="Akaike information criterion")
+    bic: float = Field(..., description="Bayesian information criterion")
+    rmse: float = Field(..., ge=0.0, description="Root mean squared error of predicted correctness")
+    accuracy: float = Field(..., ge=0.0, le=1.0, description="Fraction of responses predicted correctly")
+    num_observations: int = Field(..., ge=0, description="Number of observed responses")
+    precision_recall: List[PrecisionRecallPoint] = Field(default_factory=list, description="Precision/recall sweep over decision thresholds")
+    confidence_intervals: Dict[str, Tuple[float, float]] = Field(
+        default_factory=dict,
+        description="Bootstrap confidence intervals (lower, upper) per statistic, resampling learners"
+    )
+
 
 class MasteryLevel(BaseModel):
     """Represents a learner's mastery level for a specific competency."""
@@ -126,7 +268,7 @@ class MasteryLevel(BaseModel):
     
     # BKT state
     current_mastery: float = Field(..., ge=0.0, le=1.0, description="Current probability of mastery")
-    bkt_parameters: BKTParameters = Field(default_factory=BKTParameters, description="BKT model parameters")
+    bkt_parameters: BKTParameters = Field(default_factory=get_bkt_parameters, description="BKT model parameters")
     
     # Performance statistics
     total_interactions: int = Field(default=0, ge=0, description="Total number of interactions")
@@ -151,6 +293,63 @@ class MasteryLevel(BaseModel):
         arbitrary_types_allowed = True
         json_encoders = {ObjectId: str}
 
+    @validator("bkt_parameters", pre=True)
+    def share_bkt_parameters(cls, v):
+        """Resolve parameter dicts (e.g. from the database) to shared instances."""
+        return _shared_bkt_parameters(v)
+
+    @validator("recent_performance")
+    def keep_recent_window(cls, v):
+        """Bound recent performance to the most recent scores."""
+        if len(v) > RECENT_PERFORMANCE_WINDOW:
+            del v[:-RECENT_PERFORMANCE_WINDOW]
+        return v
+
+
+@dataclass
+class MasteryLevelBatch:
+    """
+    Column-oriented view of many mastery levels for vectorized BKT updates.
+    
+    Holds one float64 NumPy array per field (structure of arrays) instead of a
+    list of MasteryLevel objects, so bulk updates touch only the floats they
+    need at the same precision as the scalar path. Row ``i`` describes the
+    ``i``-th mastery level the batch was built from.
+    """
+    
+    current_mastery: np.ndarray
+    learn: np.ndarray
+    slip: np.ndarray
+    guess: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.current_mastery)
+
+    def __getitem__(self, index) -> "MasteryLevelBatch":
+        """Select rows; basic slices return views that share the columns."""
+        return MasteryLevelBatch(
+            current_mastery=self.current_mastery[index],
+            learn=self.learn[index],
+            slip=self.slip[index],
+            guess=self.guess[index]
+        )
+
+    @classmethod
+    def from_mastery_levels(cls, mastery_levels: List[MasteryLevel]) -> "MasteryLevelBatch":
+        """Build a batch from MasteryLevel models."""
+        count = len(mastery_levels)
+        params = [ml.bkt_parameters for ml in mastery_levels]
+
+        def column(values):
+            return np.fromiter(values, dtype=np.float64, count=count)
+
+        return cls(
+            current_mastery=column(ml.current_mastery for ml in mastery_levels),
+            learn=column(p.learning_rate for p in params),
+            slip=column(p.slip_probability for p in params),
+            guess=column(p.guess_probability for p in params)
+        )
+
 
 class ProgressReport(BaseModel):
     """Comprehensive progress report for a learner."""
@@ -187,7 +386,7 @@ class InteractionLogRequest(BaseModel):
     activity_id: str = Field(..., description="Unique identifier for the activity")
     activity_type: ActivityType = Field(..., description="Type of activity")
     interaction_type: InteractionType = Field(..., description="Type of interaction")
-    competency_ids: List[str] = Field(..., description="List of competencies addressed")
+    competency_ids: Tuple[str, ...] = Field(..., description="List of competencies addressed")
     
     # Performance data
     score: Optional[float] = Field(None, ge=0.0, le=1.0, description="Normalized score")
@@ -214,4 +413,10 @@ class MasteryUpdateResponse(BaseModel):
     new_mastery_levels: Dict[str, float] = Field(..., description="New mastery levels by competency ID")
     newly_mastered: List[str] = Field(default_factory=list, description="Newly mastered competencies")
     processing_time: float = Field(..., description="Processing time in seconds")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+
+# Specialized constructors for documents read back from the database
+_compile_fast_ctor(MicroCompetency)
+_compile_fast_ctor(LearnerInteraction, converters=dict.fromkeys(_INTERNED_ID_FIELDS, _intern_ids))
+_compile_fast_ctor(MasteryLevel, converters={"bkt_parameters": _shared_bkt_parameters})
@@ -5,56 +5,51 @@ This module provides dependency functions for injecting database connections,
 engines, and other services into API endpoints.
 """
 
-import os
 import logging
-from typing import AsyncGenerator
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+import os
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi import Depends
 
 from ..core.bkt_engine import BKTEngine
+from ..db.database import db
 from ..db.mastery_repository import MasteryRepository
 
 logger = logging.getLogger(__name__)
 
 # Global instances
-_motor_client: AsyncIOMotorClient = None
-_database: AsyncIOMotorDatabase = None
 _bkt_engine: BKTEngine = None
+_indexes_created = False
 
 
 async def get_database() -> AsyncIOMotorDatabase:
-    """Get MongoDB database instance."""
-    global _motor_client, _database
-    
-    if _database is None:
-        # Get MongoDB connection string from environment
-        mongodb_uri = os.getenv("MONGODB_URI")
-        if not mongodb_uri:
-            raise ValueError("MONGODB_URI environment variable is required")
-        
-        # Create motor client
-        _motor_client = AsyncIOMotorClient(mongodb_uri)
-        
-        # Get database (extract from URI or use default)
-        database_name = os.getenv("MONGODB_DATABASE", "adaptive_learning")
-        _database = _motor_client[database_name]
-        
-        logger.info(f"Connected to MongoDB database: {database_name}")
+    """Get the mastery tracking database, sharing the application's client."""
+    if db.client is None:
+        # Concurrent cold-start requests wait for a single connect attempt.
+        # The client is only published once its ping succeeds, so waiters
+        # behind a failed attempt see None and try again.
+        async with db.connect_lock():
+            if db.client is None:
+                await db.connect_to_mongo()
     
-    return _database
+    # Mastery data lives in its own database, separate from DATABASE_NAME
+    return db.client[os.getenv("MONGODB_DATABASE", "adaptive_learning")]
 
 
 async def get_mastery_repository(
     database: AsyncIOMotorDatabase = Depends(get_database)
 ) -> MasteryRepository:
     """Get mastery repository instance."""
+    global _indexes_created
+    
     repository = MasteryRepository(database)
     
-    # Ensure indexes are created (idempotent operation)
-    try:
-        await repository.create_indexes()
-    except Exception as e:
-        logger.warning(f"Could not create indexes: {str(e)}")
+    # Create indexes on first use only; retried on later requests if it fails
+    if not _indexes_created:
+        try:
+            await repository.create_indexes()
+            _indexes_created = True
+        except Exception as e:
+            logger.warning(f"Could not create indexes: {str(e)}")
     
     return repository
 
@@ -69,13 +64,3 @@ def get_bkt_engine() -> BKTEngine:
     
     return _bkt_engine
 
-
-async def close_database_connection():
-    """Close database connection (for application shutdown)."""
-    global _motor_client, _database
-    
-    if _motor_client:
-        _motor_client.close()
-        _motor_client = None
-        _database = None
-        logger.info("Closed MongoDB connection")
\ No newline at end of file
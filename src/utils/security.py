@@ -5,9 +5,12 @@ This module provides security functions for password management
 and authentication in the adaptive learning system.
 """
 
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 import os
+import threading
+import time
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 
@@ -19,8 +22,16 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 if not SECRET_KEY:
     raise ValueError("SECRET_KEY environment variable must be set for security")
 ALGORITHM = "HS256"
+_DECODE_ALGORITHMS = [ALGORITHM]
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Recently verified tokens, so repeat requests skip signature verification
+TOKEN_CACHE_SIZE = 4096
+_verified_tokens: "OrderedDict[str, dict]" = OrderedDict()
+# Sync dependencies run in FastAPI's threadpool, so reordering and eviction
+# must not interleave between threads
+_verified_tokens_lock = threading.Lock()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
@@ -47,8 +58,25 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 def verify_token(token: str) -> Optional[dict]:
     """Verify and decode JWT token"""
+    now = time.time()
+    with _verified_tokens_lock:
+        payload = _verified_tokens.get(token)
+        if payload is not None:
+            if payload["exp"] > now and payload.get("nbf", now) <= now:
+                _verified_tokens.move_to_end(token)
+                return dict(payload)
+            del _verified_tokens[token]
+    
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        payload = jwt.decode(token, SECRET_KEY, algorithms=_DECODE_ALGORITHMS)
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+    
+    # Only tokens that expire are cached, and never past their expiry.
+    # Callers get their own copy so they cannot alter the cached claims.
+    if isinstance(payload.get("exp"), (int, float)):
+        with _verified_tokens_lock:
+            _verified_tokens[token] = dict(payload)
+            if len(_verified_tokens) > TOKEN_CACHE_SIZE:
+                _verified_tokens.popitem(last=False)
+    return payload
@@ -6,17 +6,23 @@ including registration, authentication, profile updates, and data retrieval.
 """
 
 import pytest
-from httpx import AsyncClient
+from datetime import datetime
+from bson import ObjectId
 from fastapi.testclient import TestClient
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.main import app
+from src.api.auth import get_current_active_user
+from src.db.database import db
 from src.models.learner_profile import LearnerProfile, EducationLevel, LearningStyle
 
+# Bearer header for endpoints behind the (overridden) current-user dependency
+AUTH_HEADERS = {"Authorization": "Bearer fake-token"}
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def client():
-    """Create test client"""
+    """Create test client shared by the module"""
     return TestClient(app)
 
 
@@ -48,12 +54,9 @@ def sample_registration_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_learner_profile():
-    """Sample learner profile for mocking"""
-    from datetime import datetime
-    from bson import ObjectId
-    
+    """Sample learner profile for mocking, shared by the module (copy before mutating)"""
     return LearnerProfile(
         id=ObjectId(),
         email="test@example.com",
@@ -82,14 +85,30 @@ def sample_learner_profile():
     )
 
 
+@pytest.fixture
+def current_user(sample_learner_profile):
+    """Authenticate requests as the sample learner through a dependency override"""
+    # Routes hold a reference to get_current_active_user from Depends(), so
+    # patching the module attribute would not reach them
+    app.dependency_overrides[get_current_active_user] = lambda: sample_learner_profile
+    yield sample_learner_profile
+    app.dependency_overrides.pop(get_current_active_user, None)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mock_learner_collection():
+    """Patch the learner collection once for the module"""
+    with patch('src.api.learner_profile_routes.get_learner_collection', new_callable=AsyncMock) as mock_collection:
+        mock_collection.return_value = AsyncMock()
+        yield mock_collection
+
+
 class TestLearnerProfileAPI:
     """Test cases for learner profile API endpoints"""
     
-    @patch('src.db.database.get_learner_collection')
     @patch('src.db.learner_repository.LearnerRepository.create_learner_profile')
-    def test_register_learner_success(self, mock_create, mock_collection, client, sample_registration_data, sample_learner_profile):
+    def test_register_learner_success(self, mock_create, client, sample_registration_data, sample_learner_profile):
         """Test successful learner registration"""
-        mock_collection.return_value = AsyncMock()
         mock_create.return_value = sample_learner_profile
         
         response = client.post("/api/v1/learners/register", json=sample_registration_data)
@@ -120,11 +139,9 @@ class TestLearnerProfileAPI:
         
         assert response.status_code == 422  # Validation error
     
-    @patch('src.db.database.get_learner_collection')
     @patch('src.db.learner_repository.LearnerRepository.create_learner_profile')
-    def test_register_learner_duplicate_email(self, mock_create, mock_collection, client, sample_registration_data):
+    def test_register_learner_duplicate_email(self, mock_create, client, sample_registration_data):
         """Test registration with duplicate email"""
-        mock_collection.return_value = AsyncMock()
         mock_create.side_effect = ValueError("Email address already exists")
         
         response = client.post("/api/v1/learners/register", json=sample_registration_data)
@@ -132,12 +149,10 @@ class TestLearnerProfileAPI:
         assert response.status_code == 400
         assert "Email address already exists" in response.json()["detail"]
     
-    @patch('src.api.auth.authenticate_user')
-    @patch('src.db.database.get_learner_collection')
+    @patch('src.api.learner_profile_routes.authenticate_user')
     @patch('src.db.learner_repository.LearnerRepository.update_last_login')
-    def test_login_success(self, mock_update_login, mock_collection, mock_auth, client, sample_learner_profile):
+    def test_login_success(self, mock_update_login, mock_auth, client, sample_learner_profile):
         """Test successful login"""
-        mock_collection.return_value = AsyncMock()
         mock_auth.return_value = sample_learner_profile
         mock_update_login.return_value = True
         
@@ -154,7 +169,7 @@ class TestLearnerProfileAPI:
         assert data["token_type"] == "bearer"
         assert "expires_in" in data
     
-    @patch('src.api.auth.authenticate_user')
+    @patch('src.api.learner_profile_routes.authenticate_user')
     def test_login_invalid_credentials(self, mock_auth, client):
         """Test login with invalid credentials"""
         mock_auth.return_value = None
@@ -169,13 +184,9 @@ class TestLearnerProfileAPI:
         assert response.status_code == 401
         assert "Incorrect email or password" in response.json()["detail"]
     
-    @patch('src.api.auth.get_current_active_user')
-    def test_get_current_profile(self, mock_current_user, client, sample_learner_profile):
+    def test_get_current_profile(self, client, current_user):
         """Test getting current user profile"""
-        mock_current_user.return_value = sample_learner_profile
-        
-        headers = {"Authorization": "Bearer fake-token"}
-        response = client.get("/api/v1/learners/me", headers=headers)
+        response = client.get("/api/v1/learners/me", headers=AUTH_HEADERS)
         
         assert response.status_code == 200
         data = response.json()
@@ -189,16 +200,11 @@ class TestLearnerProfileAPI:
         
         assert response.status_code == 403  # No authorization header
     
-    @patch('src.api.auth.get_current_active_user')
-    @patch('src.db.database.get_learner_collection')
     @patch('src.db.learner_repository.LearnerRepository.update_learner_profile')
-    def test_update_profile_success(self, mock_update, mock_collection, mock_current_user, client, sample_learner_profile):
+    def test_update_profile_success(self, mock_update, client, current_user, sample_learner_profile):
         """Test successful profile update"""
-        mock_current_user.return_value = sample_learner_profile
-        mock_collection.return_value = AsyncMock()
-        
         # Create updated profile
-        updated_profile = sample_learner_profile.copy()
+        updated_profile = sample_learner_profile.copy(deep=True)
         updated_profile.first_name = "Jane"
         updated_profile.demographics.age = 30
         mock_update.return_value = updated_profile
@@ -210,104 +216,69 @@ class TestLearnerProfileAPI:
             }
         }
         
-        headers = {"Authorization": "Bearer fake-token"}
-        response = client.put("/api/v1/learners/me", json=update_data, headers=headers)
+        response = client.put("/api/v1/learners/me", json=update_data, headers=AUTH_HEADERS)
         
         assert response.status_code == 200
         data = response.json()
         assert data["first_name"] == "Jane"
     
-    @patch('src.api.auth.get_current_active_user')
-    @patch('src.db.database.get_learner_collection')
     @patch('src.db.learner_repository.LearnerRepository.update_learner_profile')
-    def test_update_profile_not_found(self, mock_update, mock_collection, mock_current_user, client, sample_learner_profile):
+    def test_update_profile_not_found(self, mock_update, client, current_user):
         """Test profile update when profile not found"""
-        mock_current_user.return_value = sample_learner_profile
-        mock_collection.return_value = AsyncMock()
         mock_update.return_value = None
         
         update_data = {"first_name": "Jane"}
         
-        headers = {"Authorization": "Bearer fake-token"}
-        response = client.put("/api/v1/learners/me", json=update_data, headers=headers)
+        response = client.put("/api/v1/learners/me", json=update_data, headers=AUTH_HEADERS)
         
         assert response.status_code == 404
     
-    @patch('src.api.auth.get_current_active_user')
-    @patch('src.db.database.get_learner_collection')
     @patch('src.db.learner_repository.LearnerRepository.get_learner_by_id')
-    def test_get_learner_by_id_own_profile(self, mock_get, mock_collection, mock_current_user, client, sample_learner_profile):
+    def test_get_learner_by_id_own_profile(self, mock_get, client, current_user, sample_learner_profile):
         """Test getting learner profile by ID (own profile)"""
-        mock_current_user.return_value = sample_learner_profile
-        mock_collection.return_value = AsyncMock()
         mock_get.return_value = sample_learner_profile
         
         learner_id = str(sample_learner_profile.id)
-        headers = {"Authorization": "Bearer fake-token"}
-        response = client.get(f"/api/v1/learners/{learner_id}", headers=headers)
+        response = client.get(f"/api/v1/learners/{learner_id}", headers=AUTH_HEADERS)
         
         assert response.status_code == 200
         data = response.json()
         assert data["email"] == "test@example.com"
     
-    @patch('src.api.auth.get_current_active_user')
-    def test_get_learner_by_id_other_profile(self, mock_current_user, client, sample_learner_profile):
-        """Test getting another learner's profile (should be forbidden)"""
-        mock_current_user.return_value = sample_learner_profile
-        
-        other_id = "507f1f77bcf86cd799439011"  # Different ID
-        headers = {"Authorization": "Bearer fake-token"}
-        response = client.get(f"/api/v1/learners/{other_id}", headers=headers)
+    @pytest.mark.parametrize("url, detail", [
+        # Another learner's profile (different ID)
+        ("/api/v1/learners/507f1f77bcf86cd799439011", "Access denied"),
+        # Searching learners is not available to regular users
+        ("/api/v1/learners", "Insufficient privileges")
+    ])
+    def test_forbidden_requests(self, client, current_user, url, detail):
+        """Test requests a regular learner is not allowed to make"""
+        response = client.get(url, headers=AUTH_HEADERS)
         
         assert response.status_code == 403
-        assert "Access denied" in response.json()["detail"]
+        assert detail in response.json()["detail"]
     
-    @patch('src.api.auth.get_current_active_user')
-    @patch('src.db.database.get_learner_collection')
     @patch('src.db.learner_repository.LearnerRepository.delete_learner_profile')
-    def test_delete_profile_success(self, mock_delete, mock_collection, mock_current_user, client, sample_learner_profile):
+    def test_delete_profile_success(self, mock_delete, client, current_user):
         """Test successful profile deletion"""
-        mock_current_user.return_value = sample_learner_profile
-        mock_collection.return_value = AsyncMock()
         mock_delete.return_value = True
         
-        headers = {"Authorization": "Bearer fake-token"}
-        response = client.delete("/api/v1/learners/me", headers=headers)
+        response = client.delete("/api/v1/learners/me", headers=AUTH_HEADERS)
         
         assert response.status_code == 204
     
-    @patch('src.api.auth.get_current_active_user')
-    @patch('src.db.database.get_learner_collection')
     @patch('src.db.learner_repository.LearnerRepository.delete_learner_profile')
-    def test_delete_profile_not_found(self, mock_delete, mock_collection, mock_current_user, client, sample_learner_profile):
+    def test_delete_profile_not_found(self, mock_delete, client, current_user):
         """Test profile deletion when profile not found"""
-        mock_current_user.return_value = sample_learner_profile
-        mock_collection.return_value = AsyncMock()
         mock_delete.return_value = False
         
-        headers = {"Authorization": "Bearer fake-token"}
-        response = client.delete("/api/v1/learners/me", headers=headers)
+        response = client.delete("/api/v1/learners/me", headers=AUTH_HEADERS)
         
         assert response.status_code == 404
     
-    @patch('src.api.auth.get_current_active_user')
-    def test_search_learners_forbidden(self, mock_current_user, client, sample_learner_profile):
-        """Test searching learners (should be forbidden for regular users)"""
-        mock_current_user.return_value = sample_learner_profile
-        
-        headers = {"Authorization": "Bearer fake-token"}
-        response = client.get("/api/v1/learners", headers=headers)
-        
-        assert response.status_code == 403
-        assert "Insufficient privileges" in response.json()["detail"]
-    
-    @patch('src.api.auth.get_current_active_user')
-    def test_get_profile_completion_stats(self, mock_current_user, client, sample_learner_profile):
+    def test_get_profile_completion_stats(self, client, current_user):
         """Test getting profile completion statistics"""
-        mock_current_user.return_value = sample_learner_profile
-        
-        headers = {"Authorization": "Bearer fake-token"}
-        response = client.get("/api/v1/learners/stats/completion", headers=headers)
+        response = client.get("/api/v1/learners/stats/completion", headers=AUTH_HEADERS)
         
         assert response.status_code == 200
         data = response.json()
@@ -319,9 +290,11 @@ class TestLearnerProfileAPI:
     
     def test_health_check(self, client):
         """Test health check endpoint"""
-        with patch('src.db.database.db.database.command') as mock_command:
-            mock_command.return_value = {"ok": 1}
-            
+        # No MongoDB here, so stand in a database whose ping succeeds
+        database = MagicMock()
+        database.command = AsyncMock(return_value={"ok": 1})
+        
+        with patch.object(db, "database", database):
             response = client.get("/health")
             
             assert response.status_code == 200
@@ -0,0 +1,92 @@
+"""
+Performance benchmarks for the BKT engine hot paths.
+
+These tests record timings with pytest-benchmark and are skipped when the
+plugin is not installed. Save a baseline with --benchmark-autosave, then run
+with --benchmark-compare --benchmark-compare-fail=mean:100% so that a change
+making any hot path more than 2x slower fails the run.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.api.mastery_endpoints import generate_recommendations
+from src.core.bkt_engine import BKTEngine
+from src.models.mastery import (
+    ActivityType,
+    InteractionType,
+    LearnerInteraction,
+    MasteryLevel,
+    MasteryLevelBatch
+)
+
+
+class TestBKTBenchmarks:
+    """Benchmarks for the BKT update and recommendation paths."""
+    
+    def setup_method(self):
+        """Set up benchmark inputs."""
+        self.bkt_engine = BKTEngine()
+        # One loop for every round, so loop creation is not part of the timing
+        self.loop = asyncio.new_event_loop()
+        rng = np.random.default_rng(0)
+        
+        self.batch = MasteryLevelBatch(
+            current_mastery=rng.random(10_000),
+            learn=np.full(10_000, 0.3),
+            slip=np.full(10_000, 0.1),
+            guess=np.full(10_000, 0.25)
+        )
+        self.is_correct = rng.random(10_000) < 0.5
+        
+        self.learner_mastery = [
+            MasteryLevel(learner_id=f"learner{i}", competency_id="comp1", current_mastery=prior)
+            for i, prior in enumerate(rng.random(1_000))
+        ]
+        self.interactions = [
+            LearnerInteraction(
+                learner_id=f"learner{i}",
+                activity_id="activity1",
+                activity_type=ActivityType.QUIZ,
+                interaction_type=InteractionType.COMPLETION,
+                competency_ids=["comp1"],
+                is_correct=bool(correct)
+            )
+            for i, correct in enumerate(rng.random(1_000) < 0.5)
+        ]
+        
+        self.mastery_levels = [
+            MasteryLevel(learner_id="learner1", competency_id=f"comp{i}", current_mastery=mastery)
+            for i, mastery in enumerate(rng.random(500))
+        ]
+    
+    def teardown_method(self):
+        """Close the event loop used by the async benchmarks."""
+        self.loop.close()
+    
+    def test_bench_batch_bkt_update(self, benchmark):
+        """Benchmark the vectorized BKT update over 10k mastery levels."""
+        updated = benchmark(self.bkt_engine.batch_bkt_update, self.batch, self.is_correct)
+        assert len(updated) == len(self.batch)
+    
+    def test_bench_batch_update_mastery(self, benchmark):
+        """Benchmark BKT updates for 1k learners with one interaction each."""
+        updated = benchmark(
+            self.bkt_engine.batch_update_mastery, self.learner_mastery, self.interactions
+        )
+        assert len(updated) == len(self.learner_mastery)
+    
+    def test_bench_generate_recommendations(self, benchmark):
+        """Benchmark recommendation generation for a 500-competency learner."""
+        def run():
+            return self.loop.run_until_complete(
+                generate_recommendations(None, self.mastery_levels)
+            )
+        
+        recommended_activities, focus_areas = benchmark(run)
+        assert len(recommended_activities) <= 10
+        assert len(focus_areas) <= 5
@@ -5,12 +5,15 @@ This module contains unit tests for the core BKT algorithm implementation
 and mastery tracking functionality.
 """
 
+import numpy as np
 import pytest
 from datetime import datetime, timedelta
 from src.core.bkt_engine import BKTEngine
+from src.core.diagnostics import compute_diagnostics, MISSING_OBSERVATION
 from src.models.mastery import (
     LearnerInteraction,
     MasteryLevel,
+    MasteryLevelBatch,
     BKTParameters,
     ActivityType,
     InteractionType,
@@ -21,12 +24,13 @@ from src.models.mastery import (
 class TestBKTEngine:
     """Test cases for the BKT engine."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.bkt_engine = BKTEngine()
+    @classmethod
+    def setup_class(cls):
+        """Set up test fixtures once; the engine and samples are never mutated."""
+        cls.bkt_engine = BKTEngine()
         
         # Create a sample mastery level
-        self.sample_mastery = MasteryLevel(
+        cls.sample_mastery = MasteryLevel(
             learner_id="test_learner",
             competency_id="test_competency",
             current_mastery=0.3,
@@ -39,7 +43,7 @@ class TestBKTEngine:
         )
         
         # Create sample interactions
-        self.correct_interaction = LearnerInteraction(
+        cls.correct_interaction = LearnerInteraction(
             learner_id="test_learner",
             activity_id="test_activity",
             activity_type=ActivityType.QUIZ,
@@ -52,7 +56,7 @@ class TestBKTEngine:
             hints_used=0
         )
         
-        self.incorrect_interaction = LearnerInteraction(
+        cls.incorrect_interaction = LearnerInteraction(
             learner_id="test_learner",
             activity_id="test_activity",
             activity_type=ActivityType.QUIZ,
@@ -81,6 +85,22 @@ class TestBKTEngine:
         assert updated_mastery.average_score == 0.9
         assert len(updated_mastery.recent_performance) == 1
         assert updated_mastery.recent_performance[0] == 0.9
+        
+        # The update leaves the original untouched and shares its parameters
+        assert self.sample_mastery.recent_performance == []
+        assert updated_mastery.bkt_parameters is self.sample_mastery.bkt_parameters
+    
+    def test_recent_performance_window(self):
+        """Test that recent performance keeps only the last 10 scores."""
+        mastery = self.sample_mastery.copy(update={"recent_performance": [0.1] * 10})
+        
+        updated_mastery = self.bkt_engine.update_mastery(mastery, self.correct_interaction)
+        
+        assert len(updated_mastery.recent_performance) == 10
+        assert updated_mastery.recent_performance[-1] == 0.9
+        assert updated_mastery.recent_performance[:-1] == [0.1] * 9
+        # The original mastery level is left untouched
+        assert mastery.recent_performance == [0.1] * 10
     
     def test_update_mastery_incorrect_response(self):
         """Test mastery update with incorrect response."""
@@ -127,6 +147,7 @@ class TestBKTEngine:
         if updated_mastery.current_mastery >= 0.8:
             assert updated_mastery.is_mastered
             assert updated_mastery.mastery_achieved_at is not None
+            assert updated_mastery.mastery_achieved_at == updated_mastery.updated_at
     
     def test_determine_correctness_explicit(self):
         """Test correctness determination with explicit is_correct field."""
@@ -166,27 +187,15 @@ class TestBKTEngine:
         assert self.bkt_engine._determine_correctness(high_score_interaction) == True
         assert self.bkt_engine._determine_correctness(low_score_interaction) == False
     
-    def test_bkt_update_formula_correct(self):
-        """Test BKT update formula with correct response."""
-        params = BKTParameters(
-            prior_knowledge=0.1,
-            learning_rate=0.3,
-            slip_probability=0.1,
-            guess_probability=0.25
-        )
-        
-        p_mastery_before = 0.3
-        updated_mastery = self.bkt_engine._bkt_update(p_mastery_before, True, params)
-        
-        # Should be a valid probability
-        assert 0.0 <= updated_mastery <= 1.0
-        
+    @pytest.mark.parametrize("p_mastery_before, is_correct, lower, upper", [
         # With correct response, mastery should generally increase
         # (though not always due to slip probability)
-        assert updated_mastery >= p_mastery_before * 0.8  # Allow some decrease due to slip
-    
-    def test_bkt_update_formula_incorrect(self):
-        """Test BKT update formula with incorrect response."""
+        (0.3, True, 0.3 * 0.8, 1.0),
+        # With incorrect response, mastery should generally decrease
+        (0.7, False, 0.0, 0.7)
+    ])
+    def test_bkt_update_formula(self, p_mastery_before, is_correct, lower, upper):
+        """Test BKT update formula with correct and incorrect responses."""
         params = BKTParameters(
             prior_knowledge=0.1,
             learning_rate=0.3,
@@ -194,14 +203,11 @@ class TestBKTEngine:
             guess_probability=0.25
         )
         
-        p_mastery_before = 0.7
-        updated_mastery = self.bkt_engine._bkt_update(p_mastery_before, False, params)
+        updated_mastery = self.bkt_engine._bkt_update(p_mastery_before, is_correct, params)
         
-        # Should be a valid probability
+        # Should be a valid probability within the expected direction
         assert 0.0 <= updated_mastery <= 1.0
-        
-        # With incorrect response, mastery should generally decrease
-        assert updated_mastery <= p_mastery_before
+        assert lower <= updated_mastery <= upper
     
     def test_batch_update_mastery(self):
         """Test batch updating of multiple mastery levels."""
@@ -249,11 +255,157 @@ class TestBKTEngine:
         # Should return updated mastery levels
         assert len(updated_levels) == 2  # Only learner1's competencies were updated
         
-        # Find the updated mastery for comp1
-        comp1_mastery = next(ml for ml in updated_levels if ml.competency_id == "comp1")
+        # Index the updated mastery levels by competency
+        updated_by_id = {ml.competency_id: ml for ml in updated_levels}
+        assert set(updated_by_id) == {"comp1", "comp2"}
+        
+        comp1_mastery = updated_by_id["comp1"]
         assert comp1_mastery.total_interactions == 1
         assert comp1_mastery.correct_interactions == 1
     
+    def test_batch_update_mastery_matches_sequential_updates(self):
+        """Test the vectorized batch path against applying update_mastery in order."""
+        start = datetime(2024, 1, 1)
+        mastery_levels = [
+            self.sample_mastery.copy(update={"learner_id": learner_id, "current_mastery": mastery})
+            for learner_id, mastery in [("learner_a", 0.3), ("learner_b", 0.75), ("learner_c", 0.1)]
+        ]
+        # Uneven history lengths, listed out of chronological order
+        outcomes = {
+            "learner_a": [True, False, True, True],
+            "learner_b": [True],
+            "learner_c": [False, True]
+        }
+        interactions = [
+            self.correct_interaction.copy(update={
+                "learner_id": learner_id,
+                "is_correct": correct,
+                "score": 0.9 if correct else 0.4,
+                "completed_at": start + timedelta(minutes=step)
+            })
+            for learner_id, history in outcomes.items()
+            for step, correct in reversed(list(enumerate(history)))
+        ]
+        
+        updated_levels = self.bkt_engine.batch_update_mastery(mastery_levels, interactions)
+        
+        assert [ml.learner_id for ml in updated_levels] == ["learner_a", "learner_b", "learner_c"]
+        for original, updated in zip(mastery_levels, updated_levels):
+            expected = original
+            for interaction in sorted(
+                (i for i in interactions if i.learner_id == original.learner_id),
+                key=lambda x: x.completed_at
+            ):
+                expected = self.bkt_engine.update_mastery(expected, interaction)
+            
+            assert updated.current_mastery == expected.current_mastery
+            assert updated.total_interactions == expected.total_interactions
+            assert updated.correct_interactions == expected.correct_interactions
+            assert updated.recent_performance == expected.recent_performance
+            assert updated.is_mastered == expected.is_mastered
+            assert original.total_interactions == 0
+    
+    def test_batch_bkt_update_matches_scalar(self):
+        """Test vectorized batch update against the scalar BKT formula."""
+        mastery_levels = [
+            MasteryLevel(
+                learner_id=f"learner{i}",
+                competency_id="comp1",
+                current_mastery=mastery,
+                bkt_parameters=BKTParameters(slip_probability=slip, guess_probability=guess)
+            )
+            for i, (mastery, slip, guess) in enumerate([
+                (0.1, 0.1, 0.25),
+                (0.5, 0.2, 0.3),
+                (0.9, 0.05, 0.1),
+                (0.5, 0.0, 0.0)
+            ])
+        ]
+        is_correct = np.array([True, False, True, True])
+        
+        batch = MasteryLevelBatch.from_mastery_levels(mastery_levels)
+        updated = self.bkt_engine.batch_bkt_update(batch, is_correct)
+        
+        assert len(batch) == 4
+        assert len(batch[:2]) == 2
+        for ml, correct, value in zip(mastery_levels, is_correct, updated):
+            expected = self.bkt_engine._bkt_update(ml.current_mastery, bool(correct), ml.bkt_parameters)
+            assert value == expected
+    
+    def test_update_mastery_arrays_matches_scalar(self):
+        """Test the array update for 10k learners against the scalar formula."""
+        rng = np.random.default_rng(7)
+        priors = rng.uniform(0.0, 1.0, 10_000)
+        is_correct = rng.random(10_000) < 0.5
+        params = self.sample_mastery.bkt_parameters
+        
+        updated = self.bkt_engine.update_mastery_arrays(
+            priors,
+            is_correct,
+            params.slip_probability,
+            params.guess_probability,
+            params.learning_rate
+        )
+        
+        expected = [
+            self.bkt_engine._bkt_update(float(prior), bool(correct), params)
+            for prior, correct in zip(priors, is_correct)
+        ]
+        np.testing.assert_allclose(updated, expected, rtol=0, atol=1e-12)
+    
+    def test_bkt_update_properties(self):
+        """Test BKT update invariants over many random priors and parameters."""
+        rng = np.random.default_rng(42)
+        count = 1024
+        
+        # Keep slip + guess < 1 so a correct answer is evidence of mastery
+        priors = rng.uniform(0.01, 0.99, count)
+        learns = rng.uniform(0.0, 0.5, count)
+        slips = rng.uniform(0.0, 0.5, count)
+        guesses = rng.uniform(0.0, 0.5, count)
+        is_correct = rng.random(count) < 0.5
+        
+        for prior, learn, slip, guess, correct in zip(priors, learns, slips, guesses, is_correct):
+            params = BKTParameters(
+                learning_rate=learn,
+                slip_probability=slip,
+                guess_probability=guess
+            )
+            updated = self.bkt_engine._bkt_update(float(prior), bool(correct), params)
+            
+            assert 0.0 <= updated <= 1.0
+            if correct:
+                assert updated >= prior - 1e-9
+    
+    def test_batch_bkt_update_properties(self):
+        """Test batched BKT update invariants over many random priors and parameters."""
+        rng = np.random.default_rng(43)
+        count = 1024
+        
+        # Keep slip + guess < 1 so a correct answer is evidence of mastery
+        batch = MasteryLevelBatch(
+            current_mastery=rng.uniform(0.01, 0.99, count),
+            learn=rng.uniform(0.0, 0.5, count),
+            slip=rng.uniform(0.0, 0.5, count),
+            guess=rng.uniform(0.0, 0.5, count)
+        )
+        is_correct = rng.random(count) < 0.5
+        
+        updated = self.bkt_engine.batch_bkt_update(batch, is_correct)
+        
+        assert np.all((updated >= 0.0) & (updated <= 1.0))
+        assert np.all(updated[is_correct] >= batch.current_mastery[is_correct] - 1e-12)
+        
+        # Spot-check against the scalar formula
+        for i in rng.choice(count, size=64, replace=False):
+            params = BKTParameters(
+                learning_rate=batch.learn[i],
+                slip_probability=batch.slip[i],
+                guess_probability=batch.guess[i]
+            )
+            expected = self.bkt_engine._bkt_update(float(batch.current_mastery[i]), bool(is_correct[i]), params)
+            assert updated[i] == pytest.approx(expected, abs=1e-12)
+    
     def test_confidence_interval_calculation(self):
         """Test confidence interval calculation."""
         mastery_level = MasteryLevel(
@@ -336,6 +488,67 @@ class TestBKTEngine:
             recommendation = self.bkt_engine.recommend_practice_intensity(mastery_level)
             assert recommendation == expected_recommendation
     
+    def test_diagnose_parameters(self):
+        """Test diagnostics built from per-learner interaction sequences."""
+        start = datetime(2024, 1, 1)
+        
+        def interaction(learner_id, minutes, is_correct, competency_id="test_competency"):
+            return self.correct_interaction.copy(update={
+                "learner_id": learner_id,
+                "competency_ids": [competency_id],
+                "is_correct": is_correct,
+                "completed_at": start + timedelta(minutes=minutes)
+            })
+        
+        interactions = [
+            interaction("learner_a", 2, False),
+            interaction("learner_a", 1, True),
+            interaction("learner_a", 3, True),
+            interaction("learner_b", 1, False),
+            interaction("learner_b", 5, True, competency_id="other_competency")
+        ]
+        
+        diagnostics = self.bkt_engine.diagnose_parameters("test_competency", interactions)
+        expected = compute_diagnostics(
+            np.array([[1, 0, 1], [0, MISSING_OBSERVATION, MISSING_OBSERVATION]]),
+            self.bkt_engine.default_parameters,
+            num_bootstrap=0
+        )
+        
+        assert diagnostics.num_observations == 4
+        assert diagnostics.log_likelihood == pytest.approx(expected["log_likelihood"], rel=1e-5)
+        assert diagnostics.accuracy == pytest.approx(expected["accuracy"])
+    
+    def test_diagnose_parameters_truncates_long_sequences(self):
+        """Test that only the first max_steps interactions per learner are scored."""
+        start = datetime(2024, 1, 1)
+        interactions = [
+            self.correct_interaction.copy(update={
+                "learner_id": "learner_a",
+                "competency_ids": ["test_competency"],
+                "is_correct": minutes % 2 == 0,
+                "completed_at": start + timedelta(minutes=minutes)
+            })
+            for minutes in range(10)
+        ]
+        
+        diagnostics = self.bkt_engine.diagnose_parameters(
+            "test_competency", interactions, max_steps=4
+        )
+        expected = compute_diagnostics(
+            np.array([[1, 0, 1, 0]]), self.bkt_engine.default_parameters, num_bootstrap=0
+        )
+        
+        assert diagnostics.num_observations == 4
+        assert diagnostics.log_likelihood == pytest.approx(expected["log_likelihood"], rel=1e-5)
+    
+    def test_diagnose_parameters_without_interactions(self):
+        """Test diagnostics for a competency with no recorded interactions."""
+        diagnostics = self.bkt_engine.diagnose_parameters("test_competency", [])
+        
+        assert diagnostics.num_observations == 0
+        assert diagnostics.precision_recall == []
+    
     def test_edge_cases_zero_denominator(self):
         """Test edge cases that might cause division by zero."""
         # Create parameters that might cause issues
@@ -0,0 +1,53 @@
+"""
+Tests for database configuration
+
+This module tests the Motor client options built from the environment.
+"""
+
+import pytest
+from pymongo import MongoClient
+
+from src.db.database import mongo_client_options
+
+
+@pytest.fixture(autouse=True)
+def pool_env(monkeypatch):
+    """Start every test without pool size overrides"""
+    monkeypatch.delenv("MONGODB_MAX_POOL_SIZE", raising=False)
+    monkeypatch.delenv("MONGODB_MIN_POOL_SIZE", raising=False)
+
+
+class TestMongoClientOptions:
+    """Test cases for the connection pool options"""
+    
+    def test_defaults(self):
+        """Test the default pool bounds"""
+        options = mongo_client_options()
+        
+        assert options["maxPoolSize"] == 100
+        assert options["minPoolSize"] == 10
+    
+    def test_small_max_pool_caps_default_min(self, monkeypatch):
+        """Test that the default minimum never exceeds a small maximum"""
+        monkeypatch.setenv("MONGODB_MAX_POOL_SIZE", "5")
+        
+        options = mongo_client_options()
+        
+        assert options["maxPoolSize"] == 5
+        assert options["minPoolSize"] == 5
+        MongoClient("mongodb://localhost:27017", connect=False, **options).close()
+    
+    def test_explicit_min_above_max_is_rejected(self, monkeypatch):
+        """Test that an explicit minimum above the maximum names both variables"""
+        monkeypatch.setenv("MONGODB_MAX_POOL_SIZE", "5")
+        monkeypatch.setenv("MONGODB_MIN_POOL_SIZE", "8")
+        
+        with pytest.raises(ValueError, match="MONGODB_MIN_POOL_SIZE.*MONGODB_MAX_POOL_SIZE"):
+            mongo_client_options()
+    
+    def test_explicit_min_within_max(self, monkeypatch):
+        """Test that an explicit minimum within the maximum is used as given"""
+        monkeypatch.setenv("MONGODB_MAX_POOL_SIZE", "5")
+        monkeypatch.setenv("MONGODB_MIN_POOL_SIZE", "2")
+        
+        assert mongo_client_options()["minPoolSize"] == 2
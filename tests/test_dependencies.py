@@ -0,0 +1,118 @@
+"""
+Tests for dependency injection utilities
+
+This module tests how the mastery endpoints obtain the shared MongoDB client,
+using a mocked Motor client so no running server is required.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo.errors import ConnectionFailure
+
+from src.db import database
+from src.utils import dependencies
+
+
+@pytest.fixture
+def motor_clients(monkeypatch):
+    """Mocked Motor clients whose first ping fails and later pings succeed"""
+    clients = []
+
+    def make_client(*args, **kwargs):
+        client = MagicMock()
+        if clients:
+            client.admin.command = AsyncMock(return_value={"ok": 1})
+        else:
+            client.admin.command = AsyncMock(side_effect=ConnectionFailure("unreachable"))
+        clients.append(client)
+        return client
+
+    monkeypatch.setenv("MONGODB_URI", "mongodb://localhost:27017")
+    monkeypatch.setenv("MONGODB_DATABASE", "adaptive_learning")
+    monkeypatch.setattr(database, "AsyncIOMotorClient", make_client)
+    monkeypatch.setattr(database.db, "client", None)
+    monkeypatch.setattr(database.db, "database", None)
+    monkeypatch.setattr(database.db, "_connect_lock", None)
+    monkeypatch.setattr(database.db, "_connect_lock_loop", None)
+    return clients
+
+
+class TestGetDatabase:
+    """Test cases for connecting the shared client on first use"""
+    
+    @pytest.mark.asyncio
+    async def test_failed_connect_is_retried(self, motor_clients):
+        """Test that a failed first connect leaves no client and the next call retries"""
+        with pytest.raises(ConnectionFailure):
+            await dependencies.get_database()
+        
+        assert database.db.client is None
+        motor_clients[0].close.assert_called_once()
+        
+        mastery_db = await dependencies.get_database()
+        
+        assert len(motor_clients) == 2
+        assert database.db.client is motor_clients[1]
+        assert mastery_db is motor_clients[1].__getitem__.return_value
+        motor_clients[1].__getitem__.assert_any_call("adaptive_learning")
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_waiters_retry_after_failed_connect(self, motor_clients):
+        """Test that requests queued behind a failed connect do not get a dead client"""
+        results = await asyncio.gather(
+            *(dependencies.get_database() for _ in range(3)),
+            return_exceptions=True
+        )
+        
+        assert isinstance(results[0], ConnectionFailure)
+        assert results[1] is results[2] is motor_clients[1].__getitem__.return_value
+        assert len(motor_clients) == 2
+    
+    @pytest.mark.asyncio
+    async def test_connected_client_is_reused(self, motor_clients):
+        """Test that later calls reuse the connected client"""
+        with pytest.raises(ConnectionFailure):
+            await dependencies.get_database()
+        
+        await dependencies.get_database()
+        await dependencies.get_database()
+        
+        assert len(motor_clients) == 2
+    
+    def test_reconnect_from_separate_event_loops(self, motor_clients):
+        """Test that connect, close and reconnect work from two event loops"""
+        async def connect_and_close():
+            # Concurrent callers make every waiter use the connect lock
+            results = await asyncio.gather(
+                *(dependencies.get_database() for _ in range(3)),
+                return_exceptions=True
+            )
+            await database.db.close_mongo_connection()
+            return results
+        
+        first = asyncio.run(connect_and_close())
+        second = asyncio.run(connect_and_close())
+        
+        assert isinstance(first[0], ConnectionFailure)
+        assert first[1] is first[2] is motor_clients[1].__getitem__.return_value
+        assert second[0] is second[1] is second[2] is motor_clients[2].__getitem__.return_value
+        assert len(motor_clients) == 3
+        motor_clients[2].close.assert_called_once()
+        assert database.db.client is None
+    
+    def test_stale_lock_from_another_loop_is_replaced(self, motor_clients):
+        """Test that a lock bound to a finished loop is not reused without a close"""
+        async def contend():
+            return await asyncio.gather(
+                *(dependencies.get_database() for _ in range(2)),
+                return_exceptions=True
+            )
+        
+        asyncio.run(contend())
+        database.db.client = None
+        
+        results = asyncio.run(contend())
+        
+        assert results[0] is results[1] is motor_clients[2].__getitem__.return_value
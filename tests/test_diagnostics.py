@@ -0,0 +1,199 @@
+"""
+Tests for BKT model diagnostics.
+
+This module checks the vectorized forward pass used to score BKT parameters
+against learner response data.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from src.core import diagnostics as diagnostics_module
+from src.core.diagnostics import (
+    compute_diagnostics,
+    _bucket_size,
+    _forward_numpy,
+    _forward_step,
+    _pad_to_bucket,
+    MISSING_OBSERVATION
+)
+from src.models.mastery import BKTParameters, BKTDiagnostics
+
+
+class TestDiagnostics:
+    """Test cases for BKT diagnostics."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.params = BKTParameters(
+            prior_knowledge=0.2,
+            learning_rate=0.3,
+            slip_probability=0.1,
+            guess_probability=0.25
+        )
+    
+    def _scalar_log_likelihood(self, sequence):
+        """Reference log-likelihood computed one step at a time."""
+        p = self.params.prior_knowledge
+        total = 0.0
+        for obs in sequence:
+            if obs == MISSING_OBSERVATION:
+                continue
+            p_correct = p * (1 - self.params.slip_probability) + (1 - p) * self.params.guess_probability
+            if obs == 1:
+                total += math.log(p_correct)
+                posterior = p * (1 - self.params.slip_probability) / p_correct
+            else:
+                total += math.log(1 - p_correct)
+                posterior = p * self.params.slip_probability / (1 - p_correct)
+            p = posterior + (1 - posterior) * self.params.learning_rate
+        return total
+    
+    def test_matches_scalar_forward_pass(self):
+        """Test vectorized log-likelihood against the step-by-step reference."""
+        observations = np.array([
+            [1, 1, 0, 1, MISSING_OBSERVATION],
+            [0, 0, 1, 1, 1],
+            [MISSING_OBSERVATION, 1, 1, 0, 1]
+        ])
+        
+        diagnostics = compute_diagnostics(observations, self.params, use_jax=False)
+        expected = sum(self._scalar_log_likelihood(row) for row in observations)
+        
+        assert diagnostics["log_likelihood"] == pytest.approx(expected, abs=1e-9)
+        assert diagnostics["num_observations"] == 13
+        assert diagnostics["aic"] == pytest.approx(8 - 2 * expected)
+        assert diagnostics["bic"] == pytest.approx(4 * math.log(13) - 2 * expected)
+        
+        model = BKTDiagnostics(**diagnostics)
+        assert 0.0 <= model.accuracy <= 1.0
+    
+    def test_precision_recall_sweep(self):
+        """Test the precision/recall sweep against a direct count per threshold."""
+        rng = np.random.default_rng(1)
+        observations = rng.integers(MISSING_OBSERVATION, 2, size=(30, 12))
+        
+        diagnostics = compute_diagnostics(
+            observations, self.params, use_jax=False, thresholds=(0.3, 0.5, 0.7), num_bootstrap=0
+        )
+        
+        # Recompute the observed predictions from the scalar reference
+        predicted, outcomes = [], []
+        for row in observations:
+            p = self.params.prior_knowledge
+            for obs in row:
+                if obs == MISSING_OBSERVATION:
+                    continue
+                p_correct = p * (1 - self.params.slip_probability) + (1 - p) * self.params.guess_probability
+                predicted.append(p_correct)
+                outcomes.append(obs == 1)
+                if obs == 1:
+                    posterior = p * (1 - self.params.slip_probability) / p_correct
+                else:
+                    posterior = p * self.params.slip_probability / (1 - p_correct)
+                p = posterior + (1 - posterior) * self.params.learning_rate
+        
+        for point in diagnostics["precision_recall"]:
+            flagged = [o for p, o in zip(predicted, outcomes) if p >= point["threshold"]]
+            expected_precision = sum(flagged) / len(flagged) if flagged else 0.0
+            assert point["precision"] == pytest.approx(expected_precision)
+            assert point["recall"] == pytest.approx(sum(flagged) / sum(outcomes))
+        
+        assert [point["threshold"] for point in diagnostics["precision_recall"]] == [0.3, 0.5, 0.7]
+        assert diagnostics["confidence_intervals"] == {}
+    
+    def test_bootstrap_intervals(self):
+        """Test that bootstrap intervals bracket the point estimates and are reproducible."""
+        rng = np.random.default_rng(2)
+        observations = rng.integers(MISSING_OBSERVATION, 2, size=(40, 15))
+        
+        diagnostics = compute_diagnostics(observations, self.params, use_jax=False, seed=7)
+        repeat = compute_diagnostics(observations, self.params, use_jax=False, seed=7)
+        
+        intervals = diagnostics["confidence_intervals"]
+        assert set(intervals) == {"log_likelihood", "rmse", "accuracy"}
+        for name, (lower, upper) in intervals.items():
+            assert lower <= diagnostics[name] <= upper
+        assert intervals == repeat["confidence_intervals"]
+        
+        model = BKTDiagnostics(**diagnostics)
+        assert len(model.precision_recall) == len(diagnostics["precision_recall"])
+    
+    def test_bootstrap_intervals_in_chunks(self, monkeypatch):
+        """Test that resample weights drawn in small chunks still give valid intervals."""
+        monkeypatch.setattr(diagnostics_module, "BOOTSTRAP_CHUNK_ELEMENTS", 50)
+        rng = np.random.default_rng(3)
+        observations = rng.integers(MISSING_OBSERVATION, 2, size=(40, 15))
+        
+        diagnostics = compute_diagnostics(observations, self.params, use_jax=False, seed=11)
+        
+        for name, (lower, upper) in diagnostics["confidence_intervals"].items():
+            assert lower <= diagnostics[name] <= upper
+    
+    def test_no_observations(self):
+        """Test diagnostics when every step is missing."""
+        observations = np.full((2, 3), MISSING_OBSERVATION)
+        
+        diagnostics = compute_diagnostics(observations, self.params, use_jax=False)
+        
+        assert diagnostics["num_observations"] == 0
+        assert diagnostics["log_likelihood"] == 0.0
+    
+    def test_rejects_non_matrix_input(self):
+        """Test that observations must be two-dimensional."""
+        with pytest.raises(ValueError):
+            compute_diagnostics([1, 0, 1], self.params)
+    
+    def test_float32_step_stays_finite(self):
+        """Test that pinned probabilities keep a finite log-likelihood in float32."""
+        p_mastery = np.ones(2, dtype=np.float32)
+        observations = np.array([0, 1], dtype=np.int8)
+        prior, learn, slip, guess = np.array([0.2, 0.3, 0.0, 0.25], dtype=np.float32)
+        
+        next_mastery, p_correct, log_term = _forward_step(
+            np, p_mastery, observations, prior, learn, slip, guess
+        )
+        
+        assert p_correct.dtype == np.float32
+        assert np.all(np.isfinite(log_term))
+        assert np.all(np.isfinite(next_mastery))
+    
+    def test_jax_matches_numpy(self):
+        """Test that the JAX kernel agrees with the NumPy forward pass."""
+        pytest.importorskip("jax")
+        rng = np.random.default_rng(0)
+        observations = rng.integers(MISSING_OBSERVATION, 2, size=(50, 20))
+        
+        expected = compute_diagnostics(observations, self.params, use_jax=False, seed=3)
+        actual = compute_diagnostics(observations, self.params, use_jax=True, seed=3)
+        
+        assert actual["num_observations"] == expected["num_observations"]
+        for key in ("log_likelihood", "aic", "bic", "rmse", "accuracy"):
+            assert actual[key] == pytest.approx(expected[key], rel=1e-12)
+        assert actual["precision_recall"] == expected["precision_recall"]
+    
+    def test_bucket_size(self):
+        """Test that kernel dimensions round up to power-of-two buckets."""
+        assert _bucket_size(1) == 16
+        assert _bucket_size(16) == 16
+        assert _bucket_size(17) == 32
+        assert _bucket_size(200) == 256
+    
+    def test_padding_leaves_real_rows_unchanged(self):
+        """Test that bucket padding does not change the forward pass output."""
+        rng = np.random.default_rng(1)
+        observations = rng.integers(MISSING_OBSERVATION, 2, size=(5, 7)).astype(np.int8)
+        params = np.array([0.2, 0.3, 0.25, 0.1])
+        
+        padded = _pad_to_bucket(observations)
+        expected = _forward_numpy(observations, params)
+        actual = _forward_numpy(padded, params)
+        
+        assert padded.shape == (16, 16)
+        assert np.all(padded[5:, :] == MISSING_OBSERVATION)
+        assert np.all(padded[:, 7:] == MISSING_OBSERVATION)
+        for full, trimmed in zip(actual, expected):
+            np.testing.assert_array_equal(full[:5, :7], trimmed)
+        assert actual[1][5:, :].sum() == 0.0
@@ -9,7 +9,9 @@ import pytest
 from pydantic import ValidationError
 
 from src.models.learner_profile import (
+    LearnerProfile,
     LearnerProfileCreate,
+    LearnerProfileResponse,
     LearnerProfileUpdate,
     Demographics,
     LearningPreferences,
@@ -18,7 +20,9 @@ from src.models.learner_profile import (
     EducationLevel,
     LearningStyle,
     ProgrammingExperienceLevel,
-    AccessibilityPreference
+    AccessibilityPreference,
+    pack_accessibility_features,
+    unpack_accessibility_flags
 )
 
 
@@ -89,6 +93,19 @@ class TestLearnerProfileModels:
                 password="SecurePass123"
             )
     
+    def test_email_accepts_internationalized_addresses(self):
+        """Test email validation keeps EmailStr semantics and schema format"""
+        profile = LearnerProfileCreate(
+            email="José.Núñez@example.com",
+            first_name="José",
+            last_name="Núñez",
+            password="SecurePass123"
+        )
+        assert profile.email == "josé.núñez@example.com"
+        
+        email_schema = LearnerProfileCreate.schema()["properties"]["email"]
+        assert email_schema["format"] == "email"
+    
     def test_password_validation(self):
         """Test password validation requirements"""
         base_data = {
@@ -211,6 +228,28 @@ class TestLearnerProfileModels:
         )
         assert len(settings.enabled_features) == 2
     
+    def test_accessibility_flags_round_trip(self):
+        """Test packing accessibility features into a bit mask and back"""
+        features = [AccessibilityPreference.HIGH_CONTRAST, AccessibilityPreference.CAPTIONS]
+        flags = pack_accessibility_features(features)
+        assert isinstance(flags, int)
+        assert unpack_accessibility_flags(flags) == features
+        
+        # Stored documents carry the mask instead of the list
+        settings = AccessibilitySettings(accessibility_flags=flags)
+        assert settings.enabled_features == features
+        assert AccessibilitySettings(accessibility_flags=0).enabled_features == []
+    
+    def test_schema_examples(self):
+        """Test OpenAPI examples are attached when the schema is generated"""
+        profile_example = LearnerProfile.schema()["example"]
+        assert profile_example["email"] == "learner@example.com"
+        assert profile_example["learning_preferences"]["learning_styles"] == ["visual", "kinesthetic"]
+        
+        response_example = LearnerProfileResponse.schema()["example"]
+        assert response_example["id"] == "507f1f77bcf86cd799439011"
+        assert response_example["is_active"] is True
+    
     def test_learner_profile_update(self):
         """Test learner profile update model"""
         update_data = {
@@ -0,0 +1,218 @@
+"""
+Tests for mastery tracking models
+
+This module tests the Pydantic models used by the mastery tracking system,
+including BKT parameter handling and database round-trips.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+
+from src.models.mastery import (
+    ActivityType,
+    BKTParameters,
+    InteractionType,
+    LearnerInteraction,
+    MasteryLevel,
+    get_bkt_parameters
+)
+from src.models._json import dumps
+
+
+class TestMasteryModels:
+    """Test cases for mastery tracking models"""
+    
+    def test_bkt_parameters_are_shared(self):
+        """Test that identical BKT parameters resolve to one shared instance"""
+        params = {
+            "prior_knowledge": 0.2,
+            "learning_rate": 0.4,
+            "slip_probability": 0.1,
+            "guess_probability": 0.2
+        }
+        
+        first = MasteryLevel(learner_id="l1", competency_id="c1", current_mastery=0.2, bkt_parameters=params)
+        second = MasteryLevel(learner_id="l2", competency_id="c1", current_mastery=0.5, bkt_parameters=dict(params))
+        
+        assert first.bkt_parameters is second.bkt_parameters
+        assert first.bkt_parameters is get_bkt_parameters(**params)
+        assert first.copy(deep=True).bkt_parameters is first.bkt_parameters
+        
+        # Default parameters are shared as well
+        default = MasteryLevel(learner_id="l3", competency_id="c2", current_mastery=0.1)
+        assert default.bkt_parameters is get_bkt_parameters()
+    
+    def test_bkt_parameters_are_immutable(self):
+        """Test that shared BKT parameters cannot be mutated in place"""
+        params = get_bkt_parameters()
+        
+        with pytest.raises(TypeError):
+            params.learning_rate = 0.9
+        
+        with pytest.raises(ValidationError):
+            get_bkt_parameters(prior_knowledge=1.5)
+    
+    def test_bkt_parameters_range_checked(self):
+        """Test that shared BKT parameters still reject out-of-range values"""
+        params = get_bkt_parameters(0.0, 1.0, 0.05, 0.3)
+        assert params.dict() == {
+            "prior_knowledge": 0.0,
+            "learning_rate": 1.0,
+            "slip_probability": 0.05,
+            "guess_probability": 0.3
+        }
+        
+        for invalid in [1.5, -0.1, float("nan")]:
+            with pytest.raises(ValidationError):
+                get_bkt_parameters(learning_rate=invalid)
+    
+    def test_from_mongo_builds_mastery_levels(self):
+        """Test hydrating a mastery level from a stored document"""
+        doc = {
+            "_id": ObjectId(),
+            "learner_id": "l1",
+            "competency_id": "c1",
+            "current_mastery": 0.4,
+            "bkt_parameters": {
+                "prior_knowledge": 0.1,
+                "learning_rate": 0.3,
+                "slip_probability": 0.1,
+                "guess_probability": 0.25
+            },
+            "recent_performance": [0.5, 0.7]
+        }
+        
+        mastery = MasteryLevel.from_mongo(doc)
+        
+        assert mastery.id == doc["_id"]
+        assert mastery.current_mastery == 0.4
+        assert mastery.bkt_parameters is get_bkt_parameters()
+        # Fields missing from the document fall back to their defaults
+        assert mastery.total_interactions == 0
+        assert mastery.mastery_threshold == 0.8
+        # The stored _id maps onto id rather than leaking as an extra field
+        assert "_id" not in mastery.dict()
+        assert mastery.dict(by_alias=True)["_id"] == doc["_id"]
+        assert "_id" not in mastery.__fields_set__
+    
+    def test_from_mongo_builds_interactions(self):
+        """Test the generated constructor for interaction documents"""
+        object_id = ObjectId()
+        doc = {
+            "_id": object_id,
+            "learner_id": "l1",
+            "activity_id": "a1",
+            "activity_type": "coding_challenge",
+            "interaction_type": "completion",
+            "competency_ids": ["c1", "c2"],
+            "score": 0.75
+        }
+        
+        interaction = LearnerInteraction.from_mongo(doc)
+        
+        assert isinstance(interaction, LearnerInteraction)
+        assert interaction.id is object_id
+        assert interaction.activity_type is ActivityType.CODING_CHALLENGE
+        assert interaction.interaction_type is InteractionType.COMPLETION
+        assert interaction.score == 0.75
+        assert interaction.competency_ids == ("c1", "c2")
+        # Missing fields fall back to their defaults
+        assert interaction.attempts == 1
+        assert interaction.difficulty_level is None
+        assert interaction.metadata == {}
+        assert interaction.__fields_set__ == {
+            "id", "learner_id", "activity_id", "activity_type",
+            "interaction_type", "competency_ids", "score"
+        }
+        assert interaction.dict(by_alias=True, exclude_unset=True)["_id"] is object_id
+    
+    def test_interaction_ids_are_interned(self):
+        """Test that repeated identifiers loaded from the database share one string object"""
+        interactions = [
+            LearnerInteraction.from_mongo({
+                "_id": ObjectId(),
+                "learner_id": "".join(["learner", "_1"]),
+                "activity_id": "a1",
+                "activity_type": "quiz",
+                "interaction_type": "attempt",
+                "competency_ids": ["".join(["arrays", "_basics"])]
+            })
+            for _ in range(2)
+        ]
+        
+        first, second = interactions
+        assert first.competency_ids == ("arrays_basics",)
+        assert first.competency_ids[0] is second.competency_ids[0]
+        assert first.learner_id is second.learner_id
+    
+    def test_trusted_loads_default_missing_timestamps(self):
+        """Test that stored documents without timestamps still load with datetimes"""
+        mastery = MasteryLevel.from_mongo({"learner_id": "l1", "competency_id": "c1", "current_mastery": 0.1})
+        assert isinstance(mastery.created_at, datetime)
+        assert isinstance(mastery.updated_at, datetime)
+        
+        interaction = LearnerInteraction.from_mongo({
+            "_id": ObjectId(),
+            "learner_id": "l1",
+            "activity_id": "a1",
+            "activity_type": "quiz",
+            "interaction_type": "attempt",
+            "competency_ids": ["c1"]
+        })
+        assert isinstance(interaction.completed_at, datetime)
+        assert isinstance(interaction.created_at, datetime)
+    
+    def test_recent_performance_is_bounded(self):
+        """Test that loading a long score history keeps only the most recent scores"""
+        scores = [i / 20 for i in range(15)]
+        mastery = MasteryLevel(learner_id="l1", competency_id="c1", current_mastery=0.1, recent_performance=scores)
+        
+        assert mastery.recent_performance == scores[-10:]
+    
+    def test_object_id_validation(self):
+        """Test that ids are parsed once and invalid ids are rejected"""
+        object_id = ObjectId()
+        
+        assert MasteryLevel(_id=str(object_id), learner_id="l1", competency_id="c1", current_mastery=0.1).id == object_id
+        assert MasteryLevel(_id=object_id, learner_id="l1", competency_id="c1", current_mastery=0.1).id is object_id
+        
+        for invalid in ["not-an-object-id", 12345]:
+            with pytest.raises(ValidationError):
+                MasteryLevel(_id=invalid, learner_id="l1", competency_id="c1", current_mastery=0.1)
+    
+    def test_dumps_encodes_object_ids_and_datetimes(self):
+        """Test that models serialize to JSON without per-field encoders"""
+        mastery = MasteryLevel(
+            learner_id="l1",
+            competency_id="c1",
+            current_mastery=0.3,
+            updated_at=datetime(2024, 1, 15, 10, 30)
+        )
+        
+        data = json.loads(dumps(mastery.dict(by_alias=True)))
+        
+        assert data["_id"] == str(mastery.id)
+        assert data["updated_at"] == "2024-01-15T10:30:00"
+        assert data["bkt_parameters"]["learning_rate"] == 0.3
+        
+        with pytest.raises(TypeError):
+            dumps({"value": object()})
+    
+    def test_jsonable_encoder_handles_object_ids(self):
+        """Test routes serialized through FastAPI's jsonable_encoder still encode ObjectIds"""
+        mastery = MasteryLevel(
+            learner_id="l1",
+            competency_id="c1",
+            current_mastery=0.3,
+            updated_at=datetime(2024, 1, 15, 10, 30)
+        )
+        
+        data = jsonable_encoder(mastery, by_alias=True)
+        
+        assert data["_id"] == str(mastery.id)
+        assert data["updated_at"] == "2024-01-15T10:30:00"
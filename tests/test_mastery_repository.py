@@ -0,0 +1,254 @@
+"""
+Tests for mastery repository
+
+This module tests the bulk and batched mastery repository operations against
+a mocked MongoDB database, so no running server is required.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from bson import ObjectId
+from pymongo import ASCENDING, ReplaceOne
+
+from src.db import mastery_repository
+from src.db.mastery_repository import MasteryRepository
+from src.core.bkt_engine import BKTEngine
+from src.core.diagnostics import compute_diagnostics, MISSING_OBSERVATION
+from src.models.mastery import MasteryLevel, get_bkt_parameters
+
+
+@pytest.fixture
+def mock_db():
+    """Mocked database exposing the mastery collections"""
+    db = MagicMock()
+    db.mastery_levels.bulk_write = AsyncMock(
+        side_effect=lambda operations, ordered: MagicMock(
+            upserted_count=len(operations) - 1,
+            modified_count=1
+        )
+    )
+    return db
+
+
+@pytest.fixture
+def repository(mock_db):
+    """Create repository instance with the mocked database"""
+    return MasteryRepository(mock_db)
+
+
+def make_mastery_level(index: int) -> MasteryLevel:
+    """Build a mastery level for a distinct competency"""
+    return MasteryLevel(
+        learner_id="learner_1",
+        competency_id=f"comp_{index}",
+        current_mastery=0.5
+    )
+
+
+class TestSaveMasteryLevels:
+    """Test cases for chunked bulk mastery writes"""
+    
+    @pytest.mark.asyncio
+    async def test_empty_list_skips_write(self, repository, mock_db):
+        """Test that saving nothing does not touch the collection"""
+        assert await repository.save_mastery_levels([]) == 0
+        mock_db.mastery_levels.bulk_write.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_chunk_boundaries_and_summed_counts(self, repository, mock_db, monkeypatch):
+        """Test that writes are split at the chunk size and counts are summed"""
+        monkeypatch.setattr(mastery_repository, "BULK_WRITE_CHUNK_SIZE", 3)
+        mastery_levels = [make_mastery_level(i) for i in range(7)]
+        
+        saved = await repository.save_mastery_levels(mastery_levels)
+        
+        calls = mock_db.mastery_levels.bulk_write.await_args_list
+        assert [len(call.args[0]) for call in calls] == [3, 3, 1]
+        assert all(call.kwargs == {"ordered": False} for call in calls)
+        assert saved == 7
+        
+        operations = [op for call in calls for op in call.args[0]]
+        assert all(isinstance(op, ReplaceOne) for op in operations)
+        assert [op._filter["competency_id"] for op in operations] == [
+            f"comp_{i}" for i in range(7)
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_exact_multiple_of_chunk_size(self, repository, mock_db, monkeypatch):
+        """Test that a full final chunk does not produce an empty write"""
+        monkeypatch.setattr(mastery_repository, "BULK_WRITE_CHUNK_SIZE", 3)
+        
+        saved = await repository.save_mastery_levels([make_mastery_level(i) for i in range(6)])
+        
+        calls = mock_db.mastery_levels.bulk_write.await_args_list
+        assert [len(call.args[0]) for call in calls] == [3, 3]
+        assert saved == 6
+
+
+class FakeCursor:
+    """In-memory cursor applying sort and limit like MongoDB does"""
+    
+    def __init__(self, docs):
+        self.docs = list(docs)
+    
+    def sort(self, key, direction):
+        self.docs.sort(key=lambda doc: doc[key], reverse=direction != ASCENDING)
+        return self
+    
+    def limit(self, limit):
+        self.docs = self.docs[:limit]
+        return self
+    
+    async def __aiter__(self):
+        for doc in self.docs:
+            yield doc
+
+
+def make_interaction_doc(learner_id: str, minutes: int, is_correct: bool) -> dict:
+    """Build a stored interaction document for one competency"""
+    return {
+        "_id": ObjectId(),
+        "learner_id": learner_id,
+        "activity_id": f"activity_{minutes}",
+        "activity_type": "quiz",
+        "interaction_type": "submission",
+        "competency_ids": ["comp_1"],
+        "is_correct": is_correct,
+        "completed_at": datetime(2024, 1, 1) + timedelta(minutes=minutes)
+    }
+
+
+class TestCompetencyHistories:
+    """Test cases for reading competency histories for diagnostics"""
+    
+    @pytest.mark.asyncio
+    async def test_window_keeps_early_history(self, repository, mock_db):
+        """Test that a limited window cuts the end of histories, not the start"""
+        docs = [
+            make_interaction_doc("learner_a", 0, False),
+            make_interaction_doc("learner_a", 1, False),
+            make_interaction_doc("learner_b", 2, True),
+            make_interaction_doc("learner_a", 3, True),
+            make_interaction_doc("learner_b", 4, True)
+        ]
+        mock_db.learner_interactions.find = MagicMock(return_value=FakeCursor(docs))
+        
+        interactions = await repository.get_competency_histories("comp_1", limit=3)
+        
+        mock_db.learner_interactions.find.assert_called_once_with({"competency_ids": "comp_1"})
+        assert [(i.learner_id, i.activity_id) for i in interactions] == [
+            ("learner_a", "activity_0"),
+            ("learner_a", "activity_1"),
+            ("learner_b", "activity_2")
+        ]
+        
+        # Every learner is scored from their first interaction onwards
+        engine = BKTEngine()
+        diagnostics = engine.diagnose_parameters("comp_1", interactions)
+        expected = compute_diagnostics(
+            np.array([[0, 0], [1, MISSING_OBSERVATION]]),
+            engine.default_parameters,
+            num_bootstrap=0
+        )
+        assert diagnostics.num_observations == 3
+        assert diagnostics.log_likelihood == pytest.approx(expected["log_likelihood"], rel=1e-5)
+
+
+class TestCompetencyPerformanceStats:
+    """Test cases for batched competency statistics"""
+    
+    @pytest.mark.asyncio
+    async def test_missing_competencies_are_zero_filled(self, repository, mock_db):
+        """Test that competencies without mastery data get zeroed statistics"""
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[{
+            "_id": "comp_a",
+            "total_learners": 4,
+            "mastered_learners": 1,
+            "average_mastery": 0.6,
+            "min_mastery": 0.2,
+            "max_mastery": 0.9,
+            "total_interactions": 20,
+            "average_interactions": 5.0
+        }])
+        mock_db.mastery_levels.aggregate = MagicMock(return_value=cursor)
+        
+        stats = await repository.get_competency_performance_stats_many(["comp_a", "comp_b"])
+        
+        pipeline = mock_db.mastery_levels.aggregate.call_args.args[0]
+        assert pipeline[0] == {"$match": {"competency_id": {"$in": ["comp_a", "comp_b"]}}}
+        assert set(stats) == {"comp_a", "comp_b"}
+        assert stats["comp_a"]["mastery_rate"] == 25.0
+        assert "_id" not in stats["comp_a"]
+        assert stats["comp_b"] == {
+            "total_learners": 0,
+            "mastered_learners": 0,
+            "average_mastery": 0.0,
+            "min_mastery": 0.0,
+            "max_mastery": 0.0,
+            "mastery_rate": 0.0,
+            "total_interactions": 0,
+            "average_interactions": 0.0
+        }
+    
+    @pytest.mark.asyncio
+    async def test_single_competency_stats_use_batch(self, repository, mock_db):
+        """Test that single competency statistics are zero-filled too"""
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[])
+        mock_db.mastery_levels.aggregate = MagicMock(return_value=cursor)
+        
+        stats = await repository.get_competency_performance_stats("comp_x")
+        
+        assert stats["total_learners"] == 0
+        assert stats["mastery_rate"] == 0.0
+
+
+class TestMasteryLevelToDoc:
+    """Test cases for building stored mastery documents"""
+    
+    def test_only_set_fields_are_written(self, repository):
+        """Test that unset defaults and the id are left out of the document"""
+        mastery_level = MasteryLevel(
+            _id=ObjectId(),
+            learner_id="learner_1",
+            competency_id="comp_1",
+            current_mastery=0.4
+        )
+        
+        doc = repository._mastery_level_to_doc(mastery_level)
+        
+        assert doc == {
+            "learner_id": "learner_1",
+            "competency_id": "comp_1",
+            "current_mastery": 0.4
+        }
+    
+    def test_nested_values_are_copied(self, repository):
+        """Test that BKT parameters and recent performance are copied, not shared"""
+        params = get_bkt_parameters(prior_knowledge=0.2, learning_rate=0.1)
+        mastery_level = MasteryLevel(
+            learner_id="learner_1",
+            competency_id="comp_1",
+            current_mastery=0.2,
+            bkt_parameters=params,
+            recent_performance=[True, False]
+        )
+        
+        doc = repository._mastery_level_to_doc(mastery_level)
+        
+        assert doc["bkt_parameters"] == {
+            "prior_knowledge": 0.2,
+            "learning_rate": 0.1,
+            "slip_probability": 0.1,
+            "guess_probability": 0.25
+        }
+        assert doc["bkt_parameters"] is not params.__dict__
+        assert doc["recent_performance"] == [True, False]
+        assert doc["recent_performance"] is not mastery_level.recent_performance
+        
+        doc["recent_performance"].append(True)
+        assert mastery_level.recent_performance == [True, False]
@@ -0,0 +1,122 @@
+"""
+Tests for security utilities
+
+This module tests JWT verification, including the cache of recently
+verified tokens.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pytest
+from jose import jwt
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+from src.utils import security
+from src.utils.security import create_access_token, verify_token
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Start every test with an empty token cache"""
+    security._verified_tokens.clear()
+    yield
+    security._verified_tokens.clear()
+
+
+def encode(claims: dict) -> str:
+    """Sign raw claims with the configured key"""
+    return jwt.encode(claims, security.SECRET_KEY, algorithm=security.ALGORITHM)
+
+
+class TestVerifyTokenCache:
+    """Test cases for the verified token cache"""
+    
+    def test_cache_hit_skips_decode(self, monkeypatch):
+        """Test that a repeat verification is served from the cache"""
+        token = create_access_token({"sub": "learner_1"})
+        assert verify_token(token)["sub"] == "learner_1"
+        assert token in security._verified_tokens
+        
+        def fail_decode(*args, **kwargs):
+            raise AssertionError("cached token was decoded again")
+        
+        monkeypatch.setattr(security.jwt, "decode", fail_decode)
+        assert verify_token(token)["sub"] == "learner_1"
+    
+    def test_returned_payload_does_not_alter_cache(self):
+        """Test that callers cannot corrupt the cached claims"""
+        token = create_access_token({"sub": "learner_1"})
+        
+        verify_token(token)["sub"] = "attacker"
+        verify_token(token)["sub"] = "attacker"
+        
+        assert verify_token(token)["sub"] == "learner_1"
+    
+    def test_expired_entry_is_evicted(self, monkeypatch):
+        """Test that an expired cached token is dropped and rejected"""
+        token = create_access_token({"sub": "learner_1"}, expires_delta=timedelta(minutes=5))
+        assert verify_token(token) is not None
+        
+        def reject_expired(*args, **kwargs):
+            raise security.JWTError("Signature has expired.")
+        
+        later = time.time() + 600
+        monkeypatch.setattr(security.time, "time", lambda: later)
+        monkeypatch.setattr(security.jwt, "decode", reject_expired)
+        
+        assert verify_token(token) is None
+        assert token not in security._verified_tokens
+    
+    def test_not_yet_valid_entry_is_rejected(self):
+        """Test that the nbf claim is re-checked on cache hits"""
+        now = time.time()
+        token = encode({"sub": "learner_1", "exp": int(now) + 600})
+        security._verified_tokens[token] = {"sub": "learner_1", "exp": now + 600, "nbf": now + 300}
+        
+        payload = verify_token(token)
+        
+        # The not-yet-valid entry is dropped and the token decoded afresh
+        assert payload == {"sub": "learner_1", "exp": int(now) + 600}
+        assert "nbf" not in security._verified_tokens[token]
+    
+    def test_token_without_exp_is_not_cached(self):
+        """Test that tokens which never expire are always fully verified"""
+        token = encode({"sub": "learner_1"})
+        
+        assert verify_token(token) == {"sub": "learner_1"}
+        assert token not in security._verified_tokens
+    
+    def test_invalid_token_is_not_cached(self):
+        """Test that tokens failing verification are not cached"""
+        assert verify_token("not-a-token") is None
+        assert len(security._verified_tokens) == 0
+    
+    def test_cache_is_bounded_lru(self, monkeypatch):
+        """Test that the least recently used token is evicted past the limit"""
+        monkeypatch.setattr(security, "TOKEN_CACHE_SIZE", 2)
+        first, second, third = (create_access_token({"sub": f"learner_{i}"}) for i in range(3))
+        
+        verify_token(first)
+        verify_token(second)
+        verify_token(first)
+        verify_token(third)
+        
+        assert list(security._verified_tokens) == [first, third]
+    
+    def test_concurrent_verification_keeps_cache_consistent(self, monkeypatch):
+        """Test that threads sharing the cache neither fail nor overfill it"""
+        monkeypatch.setattr(security, "TOKEN_CACHE_SIZE", 4)
+        tokens = [create_access_token({"sub": f"learner_{i}"}) for i in range(16)]
+        
+        def verify_all(offset):
+            return [verify_token(tokens[(offset + i) % len(tokens)])["sub"] for i in range(200)]
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(verify_all, range(8)))
+        
+        assert all(len(subjects) == 200 for subjects in results)
+        assert len(security._verified_tokens) <= 4